@@ -0,0 +1,48 @@
+"""
+Compare loop and union engines of SchemaRegistry.build()
+
+Run: python -m benchmarks.engines
+"""
+
+from __future__ import annotations
+
+import timeit
+from typing import Any
+
+from schema_overseer_local import BuildError, SchemaRegistry
+
+from .registries import create_payload, create_registry
+
+SIZES = (1, 10, 50, 200)
+NUMBER = 200
+
+
+def build_result(schema_registry: SchemaRegistry[Any], payload: dict[str, Any]) -> Any:
+    try:
+        return schema_registry.build(source_dict=payload)
+    except BuildError as error:
+        return type(error)
+
+
+def main() -> None:
+    print(f'{"schemas":>8} {"check":>6} {"payload":>8} {"loop, us":>10} {"union, us":>10} {"speedup":>8}')
+    for size in SIZES:
+        for check in (False, True):
+            loop_registry = create_registry(size, engine='loop', check_for_single_valid_schema=check)
+            union_registry = create_registry(size, engine='union', check_for_single_valid_schema=check)
+
+            for name, payload in [('first', create_payload(0)), ('last', create_payload(size - 1)), ('none', {})]:
+                loop_result = build_result(loop_registry, payload)
+                union_result = build_result(union_registry, payload)
+                assert loop_result == union_result, f'Engines disagree: {loop_result!r} != {union_result!r}'
+
+                loop_time = timeit.timeit(lambda: build_result(loop_registry, payload), number=NUMBER)  # noqa: B023
+                union_time = timeit.timeit(lambda: build_result(union_registry, payload), number=NUMBER)  # noqa: B023
+                print(
+                    f'{size:>8} {check!s:>6} {name:>8} {loop_time / NUMBER * 1e6:>10.1f} '
+                    f'{union_time / NUMBER * 1e6:>10.1f} {loop_time / union_time:>7.1f}x'
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Compare validation of wide mappings in place with splatting them into kwargs, as build(source_dict=...) did before
+
+Run: python -m benchmarks.mappings
+"""
+
+from __future__ import annotations
+
+import timeit
+import tracemalloc
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+
+from pydantic import BaseModel, ValidationError
+
+from .registries import create_payload, create_registry
+
+KEYS = (100, 300, 1000)
+SIZE = 10
+
+
+def splat_all(models: tuple[type[BaseModel], ...], payload: Mapping[str, Any]) -> type[BaseModel] | None:
+    """Previous implementation: a copy of the payload as kwargs for every schema"""
+
+    for model in models:
+        try:
+            model(**payload)
+        except ValidationError:
+            continue
+        return model
+    return None
+
+
+def validate_all(models: tuple[type[BaseModel], ...], payload: Mapping[str, Any]) -> type[BaseModel] | None:
+    for model in models:
+        try:
+            model.model_validate(payload)
+        except ValidationError:
+            continue
+        return model
+    return None
+
+
+def measure(function: Callable[[], Any]) -> tuple[float, int]:
+    """Microseconds and peak bytes allocated by a single call"""
+
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    microseconds = min(timer.repeat(repeat=3, number=number)) / number * 1e6
+
+    function()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return microseconds, peak_bytes
+
+
+def main() -> None:
+    schema_registry = create_registry(SIZE)
+    models = schema_registry.schema_order
+
+    print(f'{"keys":>6} {"input":>18} {"splat, us":>10} {"splat, B":>9} {"in place, us":>13} {"in place, B":>12}')
+    for keys in KEYS:
+        payload = create_payload(SIZE - 1)
+        payload.update({f'extra_{i}': i for i in range(keys - len(payload))})
+        inputs: list[tuple[str, Mapping[str, Any]]] = [
+            ('dict', payload),
+            ('MappingProxyType', MappingProxyType(payload)),
+        ]
+        for name, source in inputs:
+            splat_time, splat_bytes = measure(lambda: splat_all(models, source))  # noqa: B023
+            time, peak_bytes = measure(lambda: validate_all(models, source))  # noqa: B023
+            print(f'{keys:>6} {name:>18} {splat_time:>10.1f} {splat_bytes:>9} {time:>13.1f} {peak_bytes:>12}')
+
+        build_time, build_bytes = measure(lambda: schema_registry.build(source_dict=payload))  # noqa: B023
+        print(f'{keys:>6} {"build(), dict":>18} {"":>10} {"":>9} {build_time:>13.1f} {build_bytes:>12}')
+
+
+if __name__ == '__main__':
+    main()
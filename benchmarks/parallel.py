@@ -0,0 +1,44 @@
+"""
+Scaling of SchemaRegistry.build_many() across worker processes
+
+Run: python -m benchmarks.parallel
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .registries import create_payload, create_registry
+
+SIZE = 20
+RECORDS = 100_000
+CHUNK_SIZE = 2000
+
+schema_registry = create_registry(SIZE, import_path='benchmarks.parallel:schema_registry')
+
+
+def main() -> None:
+    sources = [create_payload(i % SIZE) for i in range(RECORDS)]
+
+    start = time.perf_counter()
+    expected = schema_registry.build_many(source_dicts=sources)
+    serial_time = time.perf_counter() - start
+    print(f'{"workers":>8} {"records/s":>12} {"speedup":>8}')
+    print(f'{"serial":>8} {RECORDS / serial_time:>12.0f} {1:>7.1f}x')
+
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            schema_registry.build_many(source_dicts=sources[:CHUNK_SIZE], executor=executor)  # warm up workers
+
+            start = time.perf_counter()
+            results = schema_registry.build_many(source_dicts=sources, executor=executor, chunk_size=CHUNK_SIZE)
+            parallel_time = time.perf_counter() - start
+
+        assert results == expected
+        print(f'{workers:>8} {RECORDS / parallel_time:>12.0f} {serial_time / parallel_time:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Compare SchemaRegistry.build() with the required-keys prefilter against validation of every schema
+
+Run: python -m benchmarks.prefilter
+"""
+
+from __future__ import annotations
+
+import timeit
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from schema_overseer_local import BuildError, SchemaRegistry
+
+from .registries import create_payload, create_registry
+
+SIZES = (1, 10, 50, 200)
+NUMBER = 200
+
+
+def build_result(schema_registry: SchemaRegistry[Any], payload: dict[str, Any]) -> Any:
+    try:
+        return type(schema_registry.build(source_dict=payload))
+    except BuildError as error:
+        return type(error)
+
+
+def validate_all(models: tuple[type[BaseModel], ...], payload: dict[str, Any]) -> type[BaseModel] | None:
+    """Reference implementation: try every schema until the first valid one"""
+
+    for model in models:
+        try:
+            model(**payload)
+        except ValidationError:
+            continue
+        return model
+    return None
+
+
+def main() -> None:
+    print(f'{"schemas":>8} {"payload":>8} {"all, us":>10} {"filter, us":>11} {"speedup":>8}')
+    for size in SIZES:
+        schema_registry = create_registry(size, unique_keys=True)  # schemas skipped by their required keys
+        models = schema_registry.schema_order
+
+        payloads: list[tuple[str, dict[str, Any]]] = [
+            ('first', create_payload(0, unique_keys=True)),
+            ('last', create_payload(size - 1, unique_keys=True)),
+            ('none', {}),
+        ]
+        for name, payload in payloads:
+            all_time = timeit.timeit(lambda: validate_all(models, payload), number=NUMBER)  # noqa: B023
+            filter_time = timeit.timeit(lambda: build_result(schema_registry, payload), number=NUMBER)  # noqa: B023
+            print(
+                f'{size:>8} {name:>8} {all_time / NUMBER * 1e6:>10.1f} '
+                f'{filter_time / NUMBER * 1e6:>11.1f} {all_time / filter_time:>7.1f}x'
+            )
+
+
+if __name__ == '__main__':
+    main()
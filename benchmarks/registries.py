@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Callable, List, Literal
+
+from pydantic import BaseModel, Field, create_model
+from typing_extensions import Annotated
+
+from schema_overseer_local import SchemaRegistry
+
+
+@dataclass
+class Output:
+    position: int
+    value: str
+
+
+Shape = Literal['small', 'wide', 'nested']
+WIDE_FIELDS = 50
+NESTED_DEPTH = 5
+
+
+def _create_nested_schema(depth: int) -> type[BaseModel]:
+    fields: dict[str, Any] = {'value': (str, ...), 'items': (List[int], ...)}
+    if depth > 1:
+        fields['nested'] = (_create_nested_schema(depth - 1), ...)
+    return create_model(f'Nested{depth}', **fields)
+
+
+_NESTED_SCHEMA = _create_nested_schema(NESTED_DEPTH)
+
+
+def _value_key(position: int, *, unique_keys: bool) -> str:
+    return f'value_{position}' if unique_keys else 'value'
+
+
+def create_schema(
+    position: int, *, discriminated: bool = False, shape: Shape = 'small', unique_keys: bool = False
+) -> type[BaseModel]:
+    """
+    Schema accepting payloads created by `create_payload(position, shape, unique_keys=unique_keys)`.
+    Schemas share their keys by default, so they are told apart only by validation of the `position` value;
+    with `unique_keys=True` each schema requires its own key, so the others are skipped by the required keys.
+    """
+
+    fields: dict[str, Any] = {_value_key(position, unique_keys=unique_keys): (str, ...), 'common': (int, ...)}
+    if not unique_keys:
+        fields['position'] = (Annotated[int, Field(ge=position, le=position)], ...)
+    if discriminated:
+        fields['version'] = (Literal[f'v{position}'], ...)  # type: ignore[valid-type]
+    if shape == 'wide':
+        fields.update({f'field_{i}': (int, ...) for i in range(WIDE_FIELDS)})
+    elif shape == 'nested':
+        fields['nested'] = (_NESTED_SCHEMA, ...)
+    return create_model(f'InputV{position}', **fields)
+
+
+def create_builder(model: type[BaseModel], position: int, *, unique_keys: bool = False) -> Callable[[Any], Output]:
+    value_key = _value_key(position, unique_keys=unique_keys)
+
+    def builder(data: Any) -> Output:
+        return Output(position=position, value=getattr(data, value_key))
+
+    builder.__name__ = f'builder_v{position}'
+    builder.__annotations__ = {'data': model, 'return': Output}
+    return builder
+
+
+def create_registry(
+    size: int,
+    *,
+    discriminated: bool = False,
+    shape: Shape = 'small',
+    unique_keys: bool = False,
+    **registry_kwargs: Any,
+) -> SchemaRegistry[Output]:
+    """Registry of `size` schemas with builders, each schema accepts only its own payloads"""
+
+    schema_registry = SchemaRegistry(Output, **registry_kwargs)
+    for position in range(size):
+        model = schema_registry.add_schema(
+            create_schema(position, discriminated=discriminated, shape=shape, unique_keys=unique_keys)
+        )
+        schema_registry.add_builder(create_builder(model, position, unique_keys=unique_keys))
+    schema_registry.setup()
+    return schema_registry
+
+
+def _create_nested_payload(depth: int) -> dict[str, Any]:
+    payload: dict[str, Any] = {'value': 'value', 'items': list(range(10))}
+    if depth > 1:
+        payload['nested'] = _create_nested_payload(depth - 1)
+    return payload
+
+
+def create_payload(position: int, shape: Shape = 'small', *, unique_keys: bool = False) -> dict[str, Any]:
+    """Payload valid only for the schema at `position`, use a negative position for a payload without schema"""
+
+    payload: dict[str, Any] = {
+        _value_key(position, unique_keys=unique_keys): 'value',
+        'common': '1',
+        'position': str(position),
+        'version': f'v{position}',
+    }
+    if shape == 'wide':
+        payload.update({f'field_{i}': i for i in range(WIDE_FIELDS)})
+    elif shape == 'nested':
+        payload['nested'] = _create_nested_payload(NESTED_DEPTH)
+    return payload
+
+
+def to_object(payload: Any) -> Any:
+    """Payload as an object with attributes, for `source_object`"""
+
+    if isinstance(payload, dict):
+        return SimpleNamespace(**{key: to_object(value) for key, value in payload.items()})
+    return payload
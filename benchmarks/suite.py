@@ -0,0 +1,115 @@
+"""
+Micro-benchmarks of SchemaRegistry.build() across registry sizes, payload shapes and options
+
+Run: python -m benchmarks.suite [--sizes 1 10] [--save baseline.json] [--compare baseline.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import platform
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, get_args
+
+import pydantic
+
+from schema_overseer_local import BuildError, SchemaRegistry
+
+from .registries import Shape, create_payload, create_registry, to_object
+
+SIZES = (1, 10, 50, 100, 500)
+CASES = ('first', 'last', 'none')
+SOURCES = ('dict', 'object')
+REGRESSION = 0.1  # report slowdown by more than 10%
+
+
+def build_function(schema_registry: SchemaRegistry[Any], payload: dict[str, Any], source: str) -> Callable[[], Any]:
+    def build() -> Any:
+        try:
+            if source == 'dict':
+                return schema_registry.build(source_dict=payload)
+            return schema_registry.build(source_object=obj)
+        except BuildError as error:
+            return error
+
+    obj = to_object(payload)
+    return build
+
+
+def measure(function: Callable[[], Any]) -> dict[str, float]:
+    """Operations per second and peak memory allocated by a single operation"""
+
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()  # at least 0.2 seconds
+    ops_per_sec = number / min(timer.repeat(repeat=3, number=number))
+
+    function()  # warm up lazy caches, so they are not counted
+    tracemalloc.start()  # the peak is counted from the start of tracing
+    try:
+        function()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'ops_per_sec': ops_per_sec, 'peak_bytes': peak_bytes}
+
+
+def run(sizes: tuple[int, ...], shapes: tuple[Shape, ...]) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+    for size, shape, check, validate_output in itertools.product(sizes, shapes, (False, True), (False, True)):
+        schema_registry = create_registry(
+            size, shape=shape, check_for_single_valid_schema=check, validate_output=validate_output
+        )
+        payloads = {'first': create_payload(0, shape), 'last': create_payload(size - 1, shape)}
+        payloads['none'] = create_payload(-1, shape)
+
+        for case, source in itertools.product(CASES, SOURCES):
+            key = f'size={size} shape={shape} case={case} check={check:d} validate_output={validate_output:d} {source}'
+            results[key] = measure(build_function(schema_registry, payloads[case], source))
+            print_result(key, results[key])
+    return results
+
+
+def print_result(key: str, result: dict[str, float], baseline: dict[str, float] | None = None) -> None:
+    line = f'{key:<75} {result["ops_per_sec"]:>12.0f} ops/s {result["peak_bytes"]:>9.0f} B'
+    if baseline is not None:
+        ratio = result['ops_per_sec'] / baseline['ops_per_sec']
+        mark = '  REGRESSION' if ratio < 1 - REGRESSION else ''
+        line += f' {ratio:>6.2f}x{mark}'
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--shapes', nargs='+', choices=get_args(Shape), default=get_args(Shape))
+    parser.add_argument('--save', type=Path, help='save results as a baseline JSON')
+    parser.add_argument('--compare', type=Path, help='compare results with a baseline JSON')
+    args = parser.parse_args()
+
+    print(f'{"benchmark":<75} {"throughput":>18} {"peak alloc":>11}')
+    results = run(tuple(args.sizes), tuple(args.shapes))
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())['results']
+        print(f'\nCompared with {args.compare}:')
+        for key, result in results.items():
+            if key in baseline:
+                print_result(key, result, baseline[key])
+
+    if args.save is not None:
+        environment = {
+            'python': platform.python_version(),
+            'pydantic': pydantic.VERSION,
+            'machine': platform.machine(),
+        }
+        args.save.write_text(json.dumps({'environment': environment, 'results': results}, indent=2))
+        print(f'\nBaseline saved to {args.save}')
+
+
+if __name__ == '__main__':
+    main()
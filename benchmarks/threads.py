@@ -0,0 +1,53 @@
+"""
+Throughput of SchemaRegistry.build() shared by several threads
+
+Scaling is limited by the GIL, run it with free-threaded Python to see the effect of lock-free builds.
+
+Run: python -m benchmarks.threads
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from .registries import Output, create_payload, create_registry
+
+SIZE = 20
+RECORDS = 50_000
+THREADS = (1, 2, 4, 8)
+
+schema_registry = create_registry(SIZE)
+
+
+def build_all(sources: list[dict[str, Any]]) -> list[Output]:
+    return [schema_registry.build(source_dict=source) for source in sources]
+
+
+def main() -> None:
+    sources = [create_payload(i % SIZE) for i in range(RECORDS)]
+    expected = build_all(sources)
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+
+    print(f'GIL enabled: {gil}')
+    print(f'{"threads":>8} {"records/s":>12} {"speedup":>8}')
+    base_rate = None
+    for threads in THREADS:
+        chunk_size = RECORDS // threads
+        chunks = [sources[i : i + chunk_size] for i in range(0, RECORDS, chunk_size)]
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            start = time.perf_counter()
+            results = [output for chunk in executor.map(build_all, chunks) for output in chunk]
+            elapsed = time.perf_counter() - start
+
+        assert results == expected
+        rate = RECORDS / elapsed
+        base_rate = base_rate or rate
+        print(f'{threads:>8} {rate:>12.0f} {rate / base_rate:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,11 @@
-from .exceptions import BuildError, MultipleValidSchemasError, NoMatchingSchemaError, OutputValidationError, SetupError
+from .exceptions import (
+    BuildError,
+    MultipleValidSchemasError,
+    NoMatchingSchemaError,
+    OutputValidationError,
+    SchemaFailure,
+    SetupError,
+)
 from .registry import SchemaRegistry
 
 __all__ = [
@@ -6,6 +13,7 @@ __all__ = [
     'NoMatchingSchemaError',
     'MultipleValidSchemasError',
     'OutputValidationError',
+    'SchemaFailure',
     'SchemaRegistry',
     'SetupError',
 ]
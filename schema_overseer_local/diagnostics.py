@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from itertools import islice
+from typing import AbstractSet, Any, Iterable, Sequence, Tuple, Union
+
+from pydantic import BaseModel, ValidationError
+
+from .exceptions import NoMatchingSchemaError, SchemaFailure
+from .utils import schema_name
+
+# caps of the summaries attached to NoMatchingSchemaError
+MAX_SCHEMAS = 5
+MAX_ERRORS = 3
+MAX_ERROR_LENGTH = 200
+MAX_EXCLUDED_SCHEMAS = 20  # checked in the registry order, the rest of the excluded schemas is not summarized
+
+_Error = Tuple[Tuple[Union[int, str], ...], str]  # location and message
+
+
+def no_matching_schema_error(
+    failures: Sequence[tuple[type[BaseModel], ValidationError]],
+    excluded: Iterable[tuple[type[BaseModel], Sequence[_Error]]] = (),
+) -> NoMatchingSchemaError:
+    """
+    Summarize validation errors of the closest schemas, called on the failure path only.
+    `excluded` schemas are skipped by the dispatch structures without validation, with the errors found by them;
+    the first `MAX_EXCLUDED_SCHEMAS` of them are taken.
+    """
+
+    ranked: list[tuple[type[BaseModel], int, ValidationError | Sequence[_Error]]] = [
+        *((model, error.error_count(), error) for model, error in failures),
+        *((model, len(errors), errors) for model, errors in islice(excluded, MAX_EXCLUDED_SCHEMAS)),
+    ]
+    ranked.sort(key=lambda failure: failure[1])
+    return NoMatchingSchemaError(
+        [
+            _summarize(model, count, _errors(errors) if isinstance(errors, ValidationError) else errors)
+            for model, count, errors in ranked[:MAX_SCHEMAS]
+        ]
+    )
+
+
+def excluded_errors(
+    missing: Sequence[AbstractSet[str]], rejected: Sequence[tuple[str, AbstractSet[Any]]]
+) -> list[_Error]:
+    """Errors of the schema excluded without validation: missing required keys and not accepted `Literal` values"""
+
+    errors: list[_Error] = [
+        ((), f'missing required key(s) {" or ".join(map(repr, sorted(keys)))}') for keys in missing
+    ]
+    errors.extend(((key,), f'Input should be {_expected(values)}') for key, values in rejected)
+    return errors
+
+
+def _expected(values: AbstractSet[Any]) -> str:
+    """Accepted values in the format of pydantic `Literal` errors"""
+
+    expected = sorted(map(repr, values))
+    return expected[0] if len(expected) == 1 else f'{", ".join(expected[:-1])} or {expected[-1]}'
+
+
+def union_no_matching_schema_error(models: Sequence[type[BaseModel]], error: ValidationError) -> NoMatchingSchemaError:
+    """
+    Split errors of the left-to-right union into the schemas.
+    Errors of each member are prefixed with the member location, members are reported in order.
+    """
+
+    if len(models) == 1:
+        return no_matching_schema_error([(models[0], error)])
+
+    groups: dict[Any, list[_Error]] = {}
+    for location, message in _errors(error):
+        if not location:
+            return NoMatchingSchemaError()  # the input is not validated against the schemas, e.g. invalid JSON
+        groups.setdefault(location[0], []).append((location[1:], message))
+    if len(groups) != len(models):
+        return NoMatchingSchemaError()
+
+    ranked = sorted(zip(models, groups.values()), key=lambda failure: len(failure[1]))[:MAX_SCHEMAS]
+    return NoMatchingSchemaError([_summarize(model, len(errors), errors) for model, errors in ranked])
+
+
+def _errors(error: ValidationError) -> list[_Error]:
+    details = error.errors(include_url=False, include_context=False, include_input=False)
+    return [(error_details['loc'], error_details['msg']) for error_details in details]
+
+
+def _summarize(model: type[BaseModel], error_count: int, errors: Sequence[_Error]) -> SchemaFailure:
+    summaries = []
+    for location, message in errors[:MAX_ERRORS]:
+        path = '.'.join(str(part) for part in location)
+        summaries.append((f'{path}: {message}' if path else message)[:MAX_ERROR_LENGTH])
+    return SchemaFailure(schema_name(model), error_count, tuple(summaries))
@@ -0,0 +1,610 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from functools import partial
+from threading import Lock
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Hashable,
+    List,
+    Literal,
+    Mapping,
+    NamedTuple,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+from weakref import WeakKeyDictionary
+
+from pydantic import (
+    AfterValidator,
+    AliasChoices,
+    AliasPath,
+    BaseModel,
+    Field,
+    TypeAdapter,
+    ValidationError,
+    ValidatorFunctionWrapHandler,
+    WrapValidator,
+)
+from typing_extensions import Annotated, get_args, get_origin
+
+from .utils import schema_name
+
+_Models = Tuple[Type[BaseModel], ...]
+_Getter = Callable[[str], Any]
+
+_INDEXABLE_TYPES = (str, int)
+# upper bound of the key combinations remembered by RequiredKeysFilter
+_CACHE_SIZE = 1024
+
+
+class _Marker:
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __repr__(self) -> str:
+        return f'<{self._name}>'
+
+
+MISSING: Any = _Marker('missing')
+_UNKNOWN_VALUE = _Marker('unknown value')
+
+
+def has_opaque_input(model: type[BaseModel]) -> bool:
+    """
+    Check if the model input can't be analyzed by its keys:
+    root models, or models which could transform the input before the fields validation.
+    """
+
+    decorators = model.__pydantic_decorators__
+    return (
+        model.__pydantic_root_model__
+        or model.__init__ is not BaseModel.__init__
+        or any(d.info.mode != 'after' for d in decorators.model_validators.values())
+        or bool(decorators.root_validators)
+        or bool(decorators.validators)
+    )
+
+
+def input_key(model: type[BaseModel], field_name: str) -> str | None:
+    """
+    Return the only key the field could be populated from, or None if there are several of them
+    (`populate_by_name`) or the key is not a plain string (`AliasPath`, `AliasChoices`).
+    """
+
+    field = model.model_fields[field_name]
+    key = field.validation_alias if field.validation_alias is not None else field.alias
+    if key is None:
+        return field_name
+    if not isinstance(key, str):
+        return None
+    if key != field_name and model.model_config.get('populate_by_name', False):
+        return None
+    return key
+
+
+def _field_has_input_hooks(model: type[BaseModel], field_name: str) -> bool:
+    field = model.model_fields[field_name]
+    if field.metadata:
+        return True
+    return any(
+        d.info.mode != 'after' and (field_name in d.info.fields or '*' in d.info.fields)
+        for d in model.__pydantic_decorators__.field_validators.values()
+    )
+
+
+def literal_constraints(model: type[BaseModel]) -> dict[str, frozenset[Any]]:
+    """Collect input keys of the required `Literal` fields with the values they accept"""
+
+    if has_opaque_input(model):
+        return {}
+
+    constraints = {}
+    for field_name, field in model.model_fields.items():
+        if not field.is_required() or get_origin(field.annotation) is not Literal:
+            continue
+        values = get_args(field.annotation)
+        if not all(type(value) in _INDEXABLE_TYPES for value in values):
+            continue  # e.g. enums or booleans, which could be matched by values of other types
+        key = input_key(model, field_name)
+        if key is None or _field_has_input_hooks(model, field_name):
+            continue
+        constraints[key] = frozenset(values)
+    return constraints
+
+
+def _alias_keys(alias: str | AliasPath | AliasChoices) -> set[str]:
+    """First-level input keys of the alias"""
+
+    if isinstance(alias, str):
+        return {alias}
+    if isinstance(alias, AliasPath):
+        first = alias.path[0]
+        return {first} if isinstance(first, str) else set()
+    return set().union(*(_alias_keys(choice) for choice in alias.choices))
+
+
+def required_keys(model: type[BaseModel]) -> tuple[frozenset[str], ...] | None:
+    """
+    For each required field, the input keys any of which could populate it.
+    Returns None if the model could transform its input before the validation.
+    """
+
+    if has_opaque_input(model):
+        return None
+
+    requirements = []
+    for field_name, field in model.model_fields.items():
+        if not field.is_required():
+            continue
+        keys = _field_keys(model, field_name)
+        if keys:
+            requirements.append(keys)
+    return tuple(requirements)
+
+
+def accepted_keys(model: type[BaseModel]) -> frozenset[str] | None:
+    """
+    All the input keys accepted by the model with `extra='forbid'`, any other key fails the validation of mappings.
+    Returns None if the model accepts other keys or could transform its input before the validation.
+    """
+
+    if model.model_config.get('extra') != 'forbid' or has_opaque_input(model):
+        return None
+    return frozenset().union(*(_field_keys(model, field_name) for field_name in model.model_fields))
+
+
+def _field_keys(model: type[BaseModel], field_name: str) -> frozenset[str]:
+    """First-level input keys, any of which could populate the field"""
+
+    field = model.model_fields[field_name]
+    if field.validation_alias is not None:
+        keys = _alias_keys(field.validation_alias)
+    elif field.alias is not None:
+        keys = {field.alias}
+    else:
+        keys = {field_name}
+    if model.model_config.get('populate_by_name', False):
+        keys.add(field_name)
+    return frozenset(keys)
+
+
+class RequiredKeysFilter:
+    """
+    Excludes candidate schemas with required fields missing in the input,
+    so pydantic doesn't have to build a ValidationError for them.
+    """
+
+    def __init__(self, models: Sequence[type[BaseModel]]) -> None:
+        # schema -> keys required all together, alternative keys for the fields with several possible keys
+        self._requirements: dict[type[BaseModel], tuple[frozenset[str], tuple[frozenset[str], ...]]] = {}
+        for model in models:
+            requirements = required_keys(model)
+            if not requirements:
+                continue
+            single = frozenset(key for keys in requirements if len(keys) == 1 for key in keys)
+            alternatives = tuple(keys for keys in requirements if len(keys) > 1)
+            self._requirements[model] = (single, alternatives)
+
+        self._keys = frozenset(
+            key for single, alternatives in self._requirements.values() for key in single.union(*alternatives)
+        )
+        self._cache: dict[tuple[_Models, frozenset[str]], _Models] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._requirements)
+
+    def filter(self, candidates: Sequence[type[BaseModel]], keys: AbstractSet[str]) -> _Models:
+        """Keep candidates, whose required fields are present in `keys`"""
+
+        # only keys required by some schema affect the result, so the cache is bounded by their combinations
+        signature = (tuple(candidates), self._keys.intersection(keys))
+        try:
+            return self._cache[signature]
+        except KeyError:
+            pass
+
+        present = signature[1]
+        requirements = self._requirements
+        filtered = tuple(
+            model
+            for model in candidates
+            if model not in requirements
+            or (
+                present >= requirements[model][0]
+                and all(not present.isdisjoint(alternatives) for alternatives in requirements[model][1])
+            )
+        )
+        if len(self._cache) >= _CACHE_SIZE:
+            self._cache.clear()
+        self._cache[signature] = filtered
+        return filtered
+
+    def present_attributes(self, source: Any) -> frozenset[str]:
+        """Keys of the required fields present as attributes of the object"""
+
+        try:
+            return frozenset(key for key in self._keys if getattr(source, key, MISSING) is not MISSING)
+        except Exception:  # noqa: BLE001  # slower path for properties raising other errors
+            get_value = attribute_getter(source)
+            return frozenset(key for key in self._keys if get_value(key) is not MISSING)
+
+    def missing(self, model: type[BaseModel], present: AbstractSet[str]) -> list[frozenset[str]]:
+        """Keys of the required fields of the model missing in `present` keys, any of them could populate the field"""
+
+        if model not in self._requirements:
+            return []
+        single, alternatives = self._requirements[model]
+        missing = [frozenset({key}) for key in sorted(single.difference(present))]
+        missing.extend(keys for keys in alternatives if keys.isdisjoint(present))
+        return missing
+
+
+class OverlapMatrix:
+    """
+    Pairs of schemas, which could be valid for the same input, computed statically.
+    Schemas can't overlap if they require different values of the same `Literal` field.
+    For mappings, they also can't overlap if one of them forbids extra keys and the other requires a key it doesn't accept;
+    this doesn't apply to objects, because `from_attributes` validation ignores extra attributes.
+    """
+
+    def __init__(self, models: Sequence[type[BaseModel]]) -> None:
+        literals = {model: literal_constraints(model) for model in models}
+        requirements = {model: required_keys(model) for model in models}
+        accepted = {model: accepted_keys(model) for model in models}
+
+        self._objects: dict[type[BaseModel], frozenset[type[BaseModel]]] = {}
+        self._mappings: dict[type[BaseModel], frozenset[type[BaseModel]]] = {}
+        for model in models:
+            objects, mappings = set(), set()
+            for other in models:
+                if other is model or _conflicting_literals(literals[model], literals[other]):
+                    continue
+                objects.add(other)
+                if not (
+                    _unaccepted_requirement(accepted[model], requirements[other])
+                    or _unaccepted_requirement(accepted[other], requirements[model])
+                ):
+                    mappings.add(other)
+            self._objects[model] = frozenset(objects)
+            self._mappings[model] = frozenset(mappings)
+
+    def overlapping(self, model: type[BaseModel], *, mapping: bool) -> frozenset[type[BaseModel]]:
+        """Other schemas, which could be valid for the same mapping or object as `model`"""
+        return self._mappings[model] if mapping else self._objects[model]
+
+    def to_dict(self, *, mapping: bool = True) -> dict[str, list[str]]:
+        """Qualified names of the schemas, which could overlap with each schema, for review"""
+
+        matrix = self._mappings if mapping else self._objects
+        order = {model: i for i, model in enumerate(matrix)}
+        return {
+            schema_name(model): [schema_name(other) for other in sorted(others, key=order.__getitem__)]
+            for model, others in matrix.items()
+        }
+
+
+def _conflicting_literals(constraints: Mapping[str, frozenset[Any]], other: Mapping[str, frozenset[Any]]) -> bool:
+    return any(key in other and values.isdisjoint(other[key]) for key, values in constraints.items())
+
+
+def _unaccepted_requirement(accepted: frozenset[str] | None, requirements: tuple[frozenset[str], ...] | None) -> bool:
+    """Any input with all the required keys has a key, which is not accepted"""
+
+    if accepted is None or requirements is None:
+        return False
+    return any(keys.isdisjoint(accepted) for keys in requirements)
+
+
+class DiscriminatorIndex:
+    """
+    Narrows down the candidate schemas for the input using values of required `Literal` fields,
+    e.g. `version: Literal['v3']`.
+    A schema is excluded only if the input is guaranteed to fail its validation,
+    schemas without such fields are always kept as candidates.
+    Candidates preserve the order of the schemas passed to the index.
+    """
+
+    def __init__(self, models: Sequence[type[BaseModel]]) -> None:
+        self._models: _Models = tuple(models)
+        # key -> value -> schemas accepting the value
+        self._accepting: dict[str, dict[Any, frozenset[type[BaseModel]]]] = {}
+        # key -> value type -> schemas having at least one value of that type
+        self._by_type: dict[str, dict[type, frozenset[type[BaseModel]]]] = {}
+        self._cache: dict[tuple[Any, ...], _Models] = {}
+        self._constraints = {model: literal_constraints(model) for model in self._models}
+
+        for model in self._models:
+            for key, values in self._constraints[model].items():
+                accepting = self._accepting.setdefault(key, {})
+                for value in values:
+                    accepting[value] = accepting.get(value, frozenset()) | {model}
+                by_type = self._by_type.setdefault(key, {})
+                for value_type in {type(value) for value in values}:
+                    by_type[value_type] = by_type.get(value_type, frozenset()) | {model}
+
+        self._keys = tuple(self._accepting)
+
+    def __bool__(self) -> bool:
+        return bool(self._keys)
+
+    def reorder(self, models: Sequence[type[BaseModel]]) -> None:
+        """Change the order of the candidates, `models` must be a permutation of the indexed schemas"""
+
+        self._models = tuple(models)
+        self._cache = {}
+
+    @property
+    def keys(self) -> tuple[str, ...]:
+        """Input keys used for dispatching"""
+        return self._keys
+
+    def candidates(self, get_value: _Getter) -> _Models:
+        """Return the schemas the input could be valid for, `get_value` returns MISSING for absent keys"""
+
+        signature = tuple(self._signature_item(key, get_value(key)) for key in self._keys)
+        try:
+            return self._cache[signature]
+        except KeyError:
+            pass
+
+        excluded: set[type[BaseModel]] = set()
+        for key, item in zip(self._keys, signature):
+            by_type = self._by_type[key]
+            if item is MISSING:
+                for models in by_type.values():
+                    excluded.update(models)
+            elif isinstance(item, _TypeMarker):
+                excluded.update(by_type.get(item.type, ()))
+            elif item is not _UNKNOWN_VALUE:
+                excluded.update(by_type[type(item)] - self._accepting[key][item])
+
+        candidates = tuple(model for model in self._models if model not in excluded)
+        self._cache[signature] = candidates
+        return candidates
+
+    def rejected(self, model: type[BaseModel], get_value: _Getter) -> list[tuple[str, frozenset[Any]]]:
+        """Keys of the `Literal` fields of the model with values it doesn't accept, and the accepted values"""
+
+        rejected = []
+        for key, values in self._constraints[model].items():
+            value = get_value(key)
+            if value is not MISSING and type(value) in {type(v) for v in values} and value not in values:
+                rejected.append((key, values))
+        return rejected
+
+    def _signature_item(self, key: str, value: Any) -> Any:
+        """
+        Reduce the value to a bounded set of states,
+        so the cache can't grow with the number of distinct input values.
+        """
+
+        if value is MISSING:
+            return MISSING
+        value_type = type(value)
+        if value_type not in _INDEXABLE_TYPES:
+            return _UNKNOWN_VALUE
+        if value in self._accepting[key]:
+            return value
+        return _TYPE_MARKERS[value_type]
+
+
+class _TypeMarker(_Marker):
+    """Value of the given type, that is not accepted by any of the schemas"""
+
+    def __init__(self, value_type: type) -> None:
+        super().__init__(f'unknown {value_type.__name__}')
+        self.type = value_type
+
+
+_TYPE_MARKERS = {value_type: _TypeMarker(value_type) for value_type in _INDEXABLE_TYPES}
+
+
+def reorder_by_counts(
+    models: Sequence[type[BaseModel]],
+    counts: Mapping[type[BaseModel], int],
+    groups: Mapping[type[BaseModel], str],
+) -> tuple[type[BaseModel], ...]:
+    """
+    Sort schemas by counts in descending order, but only within the contiguous runs of the same group:
+    a schema of the group isn't moved over the schemas between the members, schemas without group keep their positions.
+    """
+
+    def by_counts(run: list[type[BaseModel]]) -> list[type[BaseModel]]:
+        return sorted(run, key=lambda m: -counts.get(m, 0))  # stable for equal counts
+
+    order: list[type[BaseModel]] = []
+    run: list[type[BaseModel]] = []
+    for model in models:
+        if run and groups.get(model) != groups[run[0]]:
+            order.extend(by_counts(run))
+            run = []
+        if model in groups:
+            run.append(model)
+        else:
+            order.append(model)
+    order.extend(by_counts(run))
+    return tuple(order)
+
+
+def promote(
+    candidates: Sequence[type[BaseModel]], model: type[BaseModel], groups: Mapping[type[BaseModel], str] | None
+) -> Sequence[type[BaseModel]]:
+    """
+    Move the model to the earliest position, where it doesn't change the first valid schema:
+    to the front if `groups` is None, otherwise in front of the preceding candidates of the same group.
+    """
+
+    try:
+        position = candidates.index(model)
+    except ValueError:
+        return candidates
+
+    target = position
+    if groups is None:
+        target = 0
+    elif model in groups:
+        while target > 0 and groups.get(candidates[target - 1]) == groups[model]:
+            target -= 1
+
+    if target == position:
+        return candidates
+    return (*candidates[:target], model, *candidates[target:position], *candidates[position + 1 :])
+
+
+def leading(
+    order: Sequence[type[BaseModel]], groups: Mapping[type[BaseModel], str] | None, overlap: OverlapMatrix
+) -> frozenset[type[BaseModel]]:
+    """
+    Models, which could be tried before any other schema without changing the first valid schema for an object:
+    each preceding schema is either of the same priority group or can't be valid for the same object.
+    """
+
+    if groups is None:
+        return frozenset(order)
+    return frozenset(
+        model
+        for i, model in enumerate(order)
+        if all(
+            (model in groups and groups.get(other) == groups[model])
+            or other not in overlap.overlapping(model, mapping=False)
+            for other in order[:i]
+        )
+    )
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class FingerprintCache:
+    """
+    Bounded LRU cache of the schema matched for the inputs with the same key set (and optionally value types).
+    """
+
+    def __init__(self, maxsize: int, *, value_types: bool = False) -> None:
+        self._maxsize = maxsize
+        self._value_types = value_types
+        self._storage: OrderedDict[Hashable, type[BaseModel]] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def fingerprint(self, source: Mapping[str, Any]) -> Hashable:
+        if self._value_types:
+            return frozenset((key, type(value)) for key, value in source.items())
+        return frozenset(source)
+
+    def get(self, fingerprint: Hashable) -> type[BaseModel] | None:
+        return self._storage.get(fingerprint)
+
+    def put(self, fingerprint: Hashable, model: type[BaseModel], *, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+            self._storage[fingerprint] = model
+            self._storage.move_to_end(fingerprint)
+            if len(self._storage) > self._maxsize:
+                self._storage.popitem(last=False)
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self._hits, self._misses, self._maxsize, len(self._storage))
+
+
+class ClassCache:
+    """
+    Schema matched for the source objects of each class.
+    Classes are weakly referenced, so dynamically created classes are not kept alive by the cache.
+    """
+
+    def __init__(self) -> None:
+        self._storage: WeakKeyDictionary[type, type[BaseModel]] = WeakKeyDictionary()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, cls: type) -> type[BaseModel] | None:
+        return self._storage.get(cls)
+
+    def put(self, cls: type, model: type[BaseModel], *, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+                self._storage[cls] = model
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self._hits, self._misses, 0, len(self._storage))  # 0: unbounded, but weakly keyed
+
+
+def _tag(position: int, obj: BaseModel) -> tuple[int, BaseModel]:
+    return position, obj
+
+
+def _none_on_error(value: Any, handler: ValidatorFunctionWrapHandler) -> tuple[int, BaseModel] | None:
+    try:
+        return handler(value)  # type: ignore[no-any-return]
+    except ValidationError:
+        return None
+
+
+def _union_type(models: Sequence[type[BaseModel]]) -> Any:
+    """
+    Left-to-right union of the schemas.
+    It returns the matched schema position along with the validated object,
+    because the object type alone is ambiguous for schemas inherited from each other.
+    """
+
+    members = tuple(Annotated[model, AfterValidator(partial(_tag, i))] for i, model in enumerate(models))
+    if len(members) == 1:
+        return members[0]  # union_mode can't be applied to a single type
+    return Annotated[Union[members], Field(union_mode='left_to_right')]
+
+
+def union_adapter(models: Sequence[type[BaseModel]]) -> TypeAdapter[tuple[int, BaseModel]] | None:
+    """Compile schemas into a single validator, which returns position of the matched schema and validated object"""
+
+    if not models:
+        return None
+    return TypeAdapter(_union_type(models))
+
+
+def batch_adapter(models: Sequence[type[BaseModel]]) -> TypeAdapter[list[tuple[int, BaseModel] | None]] | None:
+    """
+    Compile schemas into a validator for the list of inputs, which validates the whole batch in one call.
+    Inputs without matching schema are returned as None instead of failing the batch.
+    """
+
+    if not models:
+        return None
+    item: Any = Annotated[_union_type(models), WrapValidator(_none_on_error)]
+    return TypeAdapter(List[item])
+
+
+def dict_getter(source: Mapping[str, Any]) -> _Getter:
+    return lambda key: source.get(key, MISSING)
+
+
+def attribute_getter(source: Any) -> _Getter:
+    def get_value(key: str) -> Any:
+        try:
+            return getattr(source, key)
+        except Exception:  # noqa: BLE001  # pydantic treats any error here as a failed field
+            return MISSING
+
+    return get_value
@@ -1,3 +1,8 @@
+from __future__ import annotations
+
+from typing import NamedTuple, Sequence
+
+
 class SetupError(Exception):
     """Could be raised during registration of schema or builders, or during SchemaRegistry.setup()"""
 
@@ -6,8 +11,35 @@ class BuildError(Exception):
     """Could be raised in runtime during SchemaRegistry.build()"""
 
 
+class SchemaFailure(NamedTuple):
+    """Summary of the input validation against the schema: total number of errors and the first of them"""
+
+    schema: str
+    error_count: int
+    errors: tuple[str, ...]
+
+
 class NoMatchingSchemaError(BuildError):
-    """Raised if not input schema was matched during SchemaRegistry.build()"""
+    """
+    Raised if not input schema was matched during SchemaRegistry.build().
+    `failures` summarize validation errors of the closest schemas, the schema with the fewest errors first.
+    """
+
+    def __init__(self, failures: Sequence[SchemaFailure] = ()) -> None:
+        super().__init__()
+        self.failures = tuple(failures)
+
+    @property
+    def closest(self) -> str | None:
+        """Qualified name of the schema with the fewest validation errors"""
+        return self.failures[0].schema if self.failures else None
+
+    def __str__(self) -> str:
+        if not self.failures:
+            return ''
+        closest = self.failures[0]
+        errors = '; '.join(closest.errors)
+        return f'closest schema {closest.schema} has {closest.error_count} validation error(s): {errors}'
 
 
 class OutputValidationError(BuildError):
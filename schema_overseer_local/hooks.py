@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import random
+import time
+from contextlib import ExitStack, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from threading import Lock
+from types import TracebackType
+from typing import Any, ContextManager, Iterator, Sequence
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+_NO_SPAN: ContextManager[Any] = nullcontext()
+
+
+class BuildHook:
+    """
+    Base class of the build hooks, override methods of the events to observe.
+    Methods returning context managers wrap the build phases like OpenTelemetry spans:
+    an exception raised in the phase, e.g. ValidationError of the failed attempt, is passed to `__exit__`.
+    """
+
+    def build(self) -> ContextManager[Any]:
+        """Whole build of a single input by build(), build_json() or abuild()"""
+        return _NO_SPAN
+
+    def attempt(self, model: type[BaseModel] | None) -> ContextManager[Any]:
+        """Validation of the input against the schema, `model` is None if all schemas are validated at once"""
+        return _NO_SPAN
+
+    def match(self, model: type[BaseModel]) -> None:
+        """The input is matched to the schema"""
+
+    def builder(self, model: type[BaseModel]) -> ContextManager[Any]:
+        """Builder call for the matched schema"""
+        return _NO_SPAN
+
+    def output_validation(self, model: type[BaseModel]) -> ContextManager[Any]:
+        """Validation of the builder output"""
+        return _NO_SPAN
+
+
+def span(hooks: Sequence[BuildHook], event: str, *args: Any) -> ContextManager[Any]:
+    """Context manager entering the spans of all the hooks for the event"""
+
+    if not hooks:
+        return _NO_SPAN
+    if len(hooks) == 1:
+        return getattr(hooks[0], event)(*args)  # type: ignore[no-any-return]
+    return _nested([getattr(hook, event)(*args) for hook in hooks])
+
+
+@contextmanager
+def _nested(spans: list[ContextManager[Any]]) -> Iterator[None]:
+    with ExitStack() as stack:
+        for nested_span in spans:
+            stack.enter_context(nested_span)
+        yield
+
+
+@dataclass(order=True)
+class BuildProfile:
+    """Duration of the build with its phases: (phase, schema name or None, duration in seconds)"""
+
+    duration: float
+    phases: list[tuple[str, str | None, float]] = field(default_factory=list, compare=False)
+    error: str | None = field(default=None, compare=False)
+
+    def __str__(self) -> str:
+        phases = ', '.join(
+            f'{phase} {"*" if name is None else name} {seconds * 1e3:.3f} ms' for phase, name, seconds in self.phases
+        )
+        error = '' if self.error is None else f' ({self.error})'
+        return f'build {self.duration * 1e3:.3f} ms{error}: {phases}'
+
+
+_current_profile: ContextVar[BuildProfile | None] = ContextVar('_current_profile', default=None)
+
+
+class SlowBuildProfiler(BuildHook):
+    """
+    Sampling profiler: measures phases of `sample_rate` share of the builds,
+    keeps `keep` slowest of them and logs the builds slower than `threshold` seconds with their phase breakdown.
+    """
+
+    def __init__(self, *, sample_rate: float = 0.01, threshold: float | None = None, keep: int = 10) -> None:
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.keep = keep
+        self._slowest: list[BuildProfile] = []  # min-heap, so the fastest of the kept builds is replaced first
+        self._lock = Lock()
+
+    @property
+    def slowest(self) -> list[BuildProfile]:
+        """Slowest of the sampled builds, the slowest first"""
+        return sorted(self._slowest, reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slowest = []
+
+    def build(self) -> ContextManager[Any]:
+        if random.random() >= self.sample_rate:  # noqa: S311  # not used for security
+            return _NO_SPAN
+        return _BuildSpan(self)
+
+    def attempt(self, model: type[BaseModel] | None) -> ContextManager[Any]:
+        return _phase_span('attempt', model)
+
+    def builder(self, model: type[BaseModel]) -> ContextManager[Any]:
+        return _phase_span('builder', model)
+
+    def output_validation(self, model: type[BaseModel]) -> ContextManager[Any]:
+        return _phase_span('output_validation', model)
+
+    def _finish(self, profile: BuildProfile) -> None:
+        with self._lock:
+            if len(self._slowest) < self.keep:
+                heapq.heappush(self._slowest, profile)
+            elif self._slowest and profile > self._slowest[0]:
+                heapq.heapreplace(self._slowest, profile)
+
+        if self.threshold is not None and profile.duration >= self.threshold:
+            logger.warning('Slow %s', profile)
+
+
+class _BuildSpan:
+    def __init__(self, profiler: SlowBuildProfiler) -> None:
+        self._profiler = profiler
+
+    def __enter__(self) -> None:
+        self._profile = BuildProfile(0.0)
+        self._token = _current_profile.set(self._profile)
+        self._start = time.perf_counter()
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self._profile.duration = time.perf_counter() - self._start
+        if exc_type is not None:
+            self._profile.error = exc_type.__name__
+        _current_profile.reset(self._token)
+        self._profiler._finish(self._profile)
+
+
+def _phase_span(phase: str, model: type[BaseModel] | None) -> ContextManager[Any]:
+    profile = _current_profile.get()
+    if profile is None:
+        return _NO_SPAN  # the build is not sampled
+    return _PhaseSpan(profile, phase, None if model is None else model.__name__)
+
+
+class _PhaseSpan:
+    """Adds the phase duration to the profile of the current build"""
+
+    def __init__(self, profile: BuildProfile, phase: str, name: str | None) -> None:
+        self._profile = profile
+        self._phase = phase
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self._profile.phases.append((self._phase, self._name, time.perf_counter() - self._start))
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import copy
+import time
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from threading import Lock
+from typing import Any, Hashable
+
+from pydantic import BaseModel
+
+from .dispatch import MISSING, CacheInfo
+
+_SCALAR_TYPES = frozenset({str, int, bool, bytes, type(None)})
+
+
+def memo_key(obj: BaseModel) -> Hashable | None:
+    """
+    Stable key of the validated input, so equal inputs have equal keys.
+    Values are tagged with their types, so e.g. `b'a'` and `'a'` or a list and a tuple in `Any` fields have different keys.
+    Floats and other values, which could be equal but differ, e.g. `Decimal('1.0')` and `Decimal('1.00')`
+    or datetimes in different timezones, are keyed by their repr too.
+    Returns None for the inputs with unhashable values of other types, they are never cached.
+    """
+
+    try:
+        return _freeze(obj)
+    except TypeError:
+        return None
+
+
+def _freeze(value: Any) -> Hashable:
+    value_type = type(value)
+    if value_type in _SCALAR_TYPES:
+        return value_type, value
+    if value_type is float:
+        return value_type, repr(value)  # keeps -0.0 apart from 0.0
+    if isinstance(value, BaseModel):
+        extra = value.__pydantic_extra__
+        return (
+            value_type,
+            tuple((name, _freeze(field_value)) for name, field_value in value.__dict__.items()),
+            None if extra is None else _freeze(extra),
+        )
+    if isinstance(value, dict):
+        return value_type, frozenset((_freeze(key), _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return value_type, tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return value_type, frozenset(_freeze(item) for item in value)
+    if is_dataclass(value) and not isinstance(value, type):
+        return value_type, tuple(_freeze(getattr(value, field.name)) for field in fields(value))
+
+    hash(value)  # raises TypeError for unhashable values
+    return value_type, value, repr(value)
+
+
+class MemoCache:
+    """
+    Bounded LRU cache of the builder outputs with optional expiration.
+    With `copy_output=True` callers get deep copies, so they can't modify the cached output.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None, *, copy_output: bool = False) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._copy_output = copy_output
+        # key -> (expiration time, output)
+        self._storage: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Any) -> Any:
+        """Return the cached output or MISSING, counting hits and misses"""
+
+        with self._lock:
+            try:
+                expires, output = self._storage[key]
+            except KeyError:
+                self._misses += 1
+                return MISSING
+            if expires < time.monotonic():
+                del self._storage[key]
+                self._misses += 1
+                return MISSING
+            self._storage.move_to_end(key)
+            self._hits += 1
+
+        return copy.deepcopy(output) if self._copy_output else output
+
+    def put(self, key: Any, output: Any) -> None:
+        expires = float('inf') if self._ttl is None else time.monotonic() + self._ttl
+        if self._copy_output:
+            output = copy.deepcopy(output)
+
+        with self._lock:
+            self._storage[key] = (expires, output)
+            self._storage.move_to_end(key)
+            if len(self._storage) > self._maxsize:
+                self._storage.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._storage.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self._hits, self._misses, self._maxsize, len(self._storage))
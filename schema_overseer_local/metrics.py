@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any, Sequence
+
+from pydantic import BaseModel
+
+from .utils import schema_name
+
+# upper bounds in seconds, validation of a small input takes microseconds
+BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0)
+PHASES = ('validation', 'builder', 'output_validation')
+
+
+class Histogram:
+    """Cumulative histogram of durations in seconds, compatible with Prometheus histograms"""
+
+    __slots__ = ('counts', 'count', 'sum')
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)  # the last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def snapshot(self) -> dict[str, Any]:
+        cumulative = 0
+        buckets: dict[str, int] = {}
+        for bound, count in zip((*map(str, BUCKETS), '+Inf'), self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {'count': self.count, 'sum': self.sum, 'buckets': buckets}
+
+
+class SchemaMetrics:
+    """Counters and phase durations of a single input schema"""
+
+    __slots__ = ('attempts', 'matches', 'failures', 'phases')
+
+    def __init__(self) -> None:
+        self.attempts = 0
+        self.matches = 0
+        self.failures = 0
+        self.phases = {phase: Histogram() for phase in PHASES}
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            'attempts': self.attempts,
+            'matches': self.matches,
+            'failures': self.failures,
+            **{phase: histogram.snapshot() for phase, histogram in self.phases.items()},
+        }
+
+
+class RegistryMetrics:
+    """
+    Metrics of the registry: validation attempts, matches and failures of each schema,
+    durations of input validation, builder and output validation, and the number of build errors.
+    Counters are updated without locks, so concurrent updates from several threads could be lost occasionally.
+    """
+
+    def __init__(self, models: Sequence[type[BaseModel]]) -> None:
+        self._schemas = {model: SchemaMetrics() for model in models}
+        self._errors: dict[str, int] = {}
+
+    def attempt(self, model: type[BaseModel], seconds: float | None, *, matched: bool) -> None:
+        """Record validation of the input against the schema, `seconds` is None if the duration is unknown"""
+
+        metrics = self._schemas[model]
+        metrics.attempts += 1
+        if matched:
+            metrics.matches += 1
+        else:
+            metrics.failures += 1
+        if seconds is not None:
+            metrics.phases['validation'].observe(seconds)
+
+    def union_attempt(self, models: Sequence[type[BaseModel]], position: int | None, seconds: float | None) -> None:
+        """
+        Record validation with the left-to-right union of `models`:
+        all schemas before the matched `position` failed, its duration is attributed to the matched schema.
+        """
+
+        failed = models if position is None else models[:position]
+        for model in failed:
+            self.attempt(model, None, matched=False)
+        if position is not None:
+            self.attempt(models[position], seconds, matched=True)
+
+    def observe(self, model: type[BaseModel], phase: str, seconds: float) -> None:
+        self._schemas[model].phases[phase].observe(seconds)
+
+    def error(self, error: Exception) -> None:
+        name = type(error).__name__
+        self._errors[name] = self._errors.get(name, 0) + 1
+
+    def reset(self) -> None:
+        self._schemas = {model: SchemaMetrics() for model in self._schemas}
+        self._errors = {}
+
+    def snapshot(self) -> dict[str, Any]:
+        """Metrics as a JSON-compatible dict, schemas are keyed by their qualified names"""
+
+        return {
+            'schemas': {schema_name(model): metrics.snapshot() for model, metrics in self._schemas.items()},
+            'errors': dict(self._errors),
+        }
+
+    def prometheus(self, prefix: str = 'schema_overseer') -> str:
+        """Metrics in Prometheus text exposition format"""
+
+        lines: list[str] = []
+        counters = (
+            ('attempts', 'Validation attempts of the input schema'),
+            ('matches', 'Inputs matched to the input schema'),
+            ('failures', 'Failed validations of the input schema'),
+        )
+        for name, description in counters:
+            lines += [f'# HELP {prefix}_{name}_total {description}', f'# TYPE {prefix}_{name}_total counter']
+            lines += [
+                f'{prefix}_{name}_total{{schema="{_escape(schema_name(model))}"}} {getattr(metrics, name)}'
+                for model, metrics in self._schemas.items()
+            ]
+
+        name = f'{prefix}_phase_duration_seconds'
+        lines += [f'# HELP {name} Duration of the build phase', f'# TYPE {name} histogram']
+        for model, metrics in self._schemas.items():
+            for phase, histogram in metrics.phases.items():
+                labels = f'schema="{_escape(schema_name(model))}",phase="{phase}"'
+                snapshot = histogram.snapshot()
+                lines += [
+                    f'{name}_bucket{{{labels},le="{bound}"}} {count}' for bound, count in snapshot['buckets'].items()
+                ]
+                lines += [f'{name}_sum{{{labels}}} {snapshot["sum"]}', f'{name}_count{{{labels}}} {snapshot["count"]}']
+
+        lines += [f'# HELP {prefix}_errors_total Build errors by type', f'# TYPE {prefix}_errors_total counter']
+        lines += [f'{prefix}_errors_total{{error="{error}"}} {count}' for error, count in self._errors.items()]
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(label_value: str) -> str:
+    return label_value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
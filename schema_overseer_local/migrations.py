@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import inspect
+from collections import deque
+from typing import Any, Awaitable, Callable, Iterable, Mapping, Sequence
+
+from pydantic import BaseModel
+
+_Migration = Callable[[Any], BaseModel]
+
+
+def migration_chains(
+    migrations: Mapping[type[BaseModel], Mapping[type[BaseModel], _Migration]], targets: Iterable[type[BaseModel]]
+) -> dict[type[BaseModel], tuple[type[BaseModel], ...]]:
+    """
+    Shortest chain of migrations from each schema to any of `targets`, the schemas with builders.
+    Each chain starts with the schema and ends with the target; targets themselves are not included.
+    Breadth-first search from all the targets at once over the reversed migrations, so chains are found in one pass.
+    """
+
+    sources: dict[type[BaseModel], list[type[BaseModel]]] = {}
+    for source, steps in migrations.items():
+        for target in steps:
+            sources.setdefault(target, []).append(source)
+
+    next_schema: dict[type[BaseModel], type[BaseModel] | None] = dict.fromkeys(targets)
+    queue = deque(next_schema)
+    while queue:
+        target = queue.popleft()
+        for source in sources.get(target, ()):
+            if source not in next_schema:
+                next_schema[source] = target
+                queue.append(source)
+
+    chains = {}
+    for model, step in next_schema.items():
+        if step is None:
+            continue
+        chain = [model]
+        while step is not None:
+            chain.append(step)
+            step = next_schema[step]
+        chains[model] = tuple(chain)
+    return chains
+
+
+def compose(
+    steps: Sequence[_Migration], builder: Callable[[Any], Any | Awaitable[Any]]
+) -> Callable[[BaseModel], Any | Awaitable[Any]]:
+    """Single callable applying the migrations and the builder, an async one for async builders"""
+
+    if inspect.iscoroutinefunction(builder):
+
+        async def composed_async(obj: BaseModel) -> Any:
+            for step in steps:
+                obj = step(obj)
+            return await builder(obj)
+
+        return composed_async
+
+    def composed(obj: BaseModel) -> Any:
+        for step in steps:
+            obj = step(obj)
+        return builder(obj)
+
+    return composed
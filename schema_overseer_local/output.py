@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from dataclasses import is_dataclass
+from typing import Any, Generic, Literal, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import CoreSchema, SchemaValidator
+
+_OutputType = TypeVar('_OutputType')
+
+
+def _revalidating_schema(schema: CoreSchema) -> CoreSchema | None:
+    """
+    Copy of the model or dataclass schema, which validates fields of the instances instead of passing them as is.
+    Nested models and dataclasses, including the ones in `definitions`, are revalidated too.
+    """
+
+    inner_schema = schema
+    if schema['type'] == 'definitions':
+        inner_schema = schema['schema']
+        if inner_schema['type'] == 'definition-ref':
+            refs = {definition.get('ref'): definition for definition in schema['definitions']}
+            inner_schema = refs[inner_schema['schema_ref']]
+    if inner_schema['type'] not in ('model', 'dataclass'):
+        return None
+    return _revalidate_instances(schema)  # type: ignore[no-any-return]
+
+
+def _revalidate_instances(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_revalidate_instances(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    copied = {key: _revalidate_instances(item) for key, item in value.items()}
+    if copied.get('type') in ('model', 'dataclass'):
+        copied['revalidate_instances'] = 'always'
+    return copied
+
+
+class OutputValidator(Generic[_OutputType]):
+    """
+    Output type validator compiled once.
+    Instances of exactly the output type are validated as is, other objects are converted to the output type.
+    """
+
+    def __init__(self, output_type: type[_OutputType]) -> None:
+        self._output_type = output_type
+        self._adapter = TypeAdapter(output_type)
+        schema = _revalidating_schema(self._adapter.core_schema)
+        self._instance_validator = None if schema is None else SchemaValidator(schema)
+
+    def validate(self, output: Any) -> _OutputType:
+        if self._instance_validator is not None and type(output) is self._output_type:
+            # fields are validated without dumping, including the fields of nested models and dataclasses
+            return self._instance_validator.validate_python(output)  # type: ignore[no-any-return]
+
+        # https://github.com/pydantic/pydantic-core/issues/755
+        data: Any
+        if is_dataclass(self._output_type):
+            data = output.__dict__
+        elif isinstance(output, BaseModel):
+            data = output.model_dump(mode='python')
+        else:
+            data = output
+        return self._adapter.validate_python(data)
+
+
+class OutputSerializer:
+    """Output type serializer compiled once, so outputs are dumped without looking up the type schema for each of them"""
+
+    def __init__(self, output_type: type[Any]) -> None:
+        self._serializer = TypeAdapter(output_type).serializer
+
+    def to_python(self, output: Any, *, mode: Literal['python', 'json']) -> Any:
+        return self._serializer.to_python(output, mode=mode)
+
+    def to_json(self, output: Any) -> bytes:
+        return self._serializer.to_json(output)
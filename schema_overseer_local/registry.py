@@ -1,25 +1,126 @@
 from __future__ import annotations
 
+import asyncio
 import inspect
-from dataclasses import is_dataclass
-from typing import Any, Callable, Generic, Sequence, TypeVar, cast, overload
+import random
+import time
+from concurrent.futures import Executor
+from contextlib import suppress
+from itertools import repeat
+from os import PathLike
+from types import MappingProxyType
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
 
-from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic import (
+    BaseModel,
+    PydanticSchemaGenerationError,
+    PydanticUndefinedAnnotation,
+    TypeAdapter,
+    ValidationError,
+)
+from pydantic_core import PydanticSerializationError
 from typing_extensions import get_type_hints
 
-from .exceptions import MultipleValidSchemasError, NoMatchingSchemaError, OutputValidationError, SetupError
-from .utils import import_string
+from .diagnostics import excluded_errors, no_matching_schema_error, union_no_matching_schema_error
+from .dispatch import (
+    MISSING,
+    CacheInfo,
+    ClassCache,
+    DiscriminatorIndex,
+    FingerprintCache,
+    OverlapMatrix,
+    RequiredKeysFilter,
+    attribute_getter,
+    batch_adapter,
+    dict_getter,
+    leading,
+    promote,
+    reorder_by_counts,
+    union_adapter,
+)
+from .exceptions import BuildError, MultipleValidSchemasError, NoMatchingSchemaError, OutputValidationError, SetupError
+from .hooks import BuildHook, span
+from .memo import MemoCache, memo_key
+from .metrics import RegistryMetrics
+from .migrations import compose, migration_chains
+from .output import OutputSerializer, OutputValidator
+from .utils import LinesSource, discover, import_object, iter_lines
 
 _OutputType = TypeVar('_OutputType')
 _InputSchema = TypeVar('_InputSchema', bound=BaseModel)
+_Builder = TypeVar('_Builder', bound=Callable[..., Any])
+_Hook = TypeVar('_Hook', bound=BuildHook)
+_Migration = TypeVar('_Migration', bound=Callable[..., BaseModel])
 
 
 class SchemaRegistry(Generic[_OutputType]):
     validate_output: bool
+    validate_output_rate: float
+    validate_output_first: int
     check_for_single_valid_schema: bool
+    engine: Literal['loop', 'union']
+    adaptive_order: bool
+    adaptive_order_interval: int
+    fingerprint_cache_size: int
+    fingerprint_value_types: bool
+    class_cache: bool
+    hint_fallback: bool
+    memoize: bool
+    memoize_size: int
+    memoize_ttl: float | None
+    memoize_copy: bool
+    collect_metrics: bool
     _output_type: type[_OutputType]
     _discovery_paths: Sequence[str]
-    _storage: dict[type[BaseModel], Callable[[BaseModel], _OutputType] | None]
+    _discovery_manifest: str | PathLike[str] | None
+    _import_times: dict[str, float]
+    _import_path: str | None
+    _storage: dict[type[BaseModel], Callable[[BaseModel], _OutputType | Awaitable[_OutputType]] | None]
+    _builders: Mapping[type[BaseModel], Callable[[BaseModel], _OutputType | Awaitable[_OutputType]]]
+    _async_models: frozenset[type[BaseModel]]
+    _migrations: dict[type[BaseModel], dict[type[BaseModel], Callable[[Any], BaseModel]]]
+    _migration_chains: dict[type[BaseModel], tuple[type[BaseModel], ...]]
+    _memoize: dict[type[BaseModel], bool]
+    _memo_caches: dict[type[BaseModel], MemoCache]
+    _metrics: RegistryMetrics | None
+    _hooks: tuple[BuildHook, ...]
+    _priority_groups: dict[type[BaseModel], str]
+    _versions: dict[str, type[BaseModel]]
+    _wrong_hints: dict[str, int]
+    _models: tuple[type[BaseModel], ...]
+    _order: tuple[type[BaseModel], ...]
+    _match_counts: dict[type[BaseModel], int]
+    _matches_since_reorder: int
+    _fingerprint_cache: FingerprintCache | None
+    _class_cache: ClassCache | None
+    _leading: frozenset[type[BaseModel]]
+    _dict_only_models: bool
+    _positions: dict[type[BaseModel], int]
+    _index: DiscriminatorIndex
+    _required_keys: RequiredKeysFilter
+    _overlap: OverlapMatrix | None
+    _union_adapter: TypeAdapter[tuple[int, BaseModel]] | None
+    _batch_adapter: TypeAdapter[list[tuple[int, BaseModel] | None]] | None
+    _output_validator: OutputValidator[_OutputType] | None
+    _output_serializer: OutputSerializer | None
+    _output_validations: dict[type[BaseModel], int]
     _setup_done: bool
 
     def __init__(
@@ -27,23 +128,131 @@ class SchemaRegistry(Generic[_OutputType]):
         output_type: type[_OutputType],
         *,
         discovery_paths: Sequence[str] = (),
+        discovery_manifest: str | PathLike[str] | None = None,
+        import_path: str | None = None,
         validate_output: bool = False,
+        validate_output_rate: float = 1.0,
+        validate_output_first: int = 0,
         check_for_single_valid_schema: bool = False,
+        engine: Literal['loop', 'union'] = 'loop',
+        adaptive_order: bool = False,
+        adaptive_order_interval: int = 1000,
+        fingerprint_cache_size: int = 0,
+        fingerprint_value_types: bool = False,
+        class_cache: bool = False,
+        hint_fallback: bool = False,
+        memoize: bool = False,
+        memoize_size: int = 1024,
+        memoize_ttl: float | None = None,
+        memoize_copy: bool = False,
+        collect_metrics: bool = False,
     ) -> None:
         self._output_type = output_type
         self._discovery_paths = discovery_paths
+        self._discovery_manifest = discovery_manifest
+        self._import_times = {}
+        self._import_path = import_path
         self._storage = {}
+        self._priority_groups = {}
+        self._versions = {}
+        self._wrong_hints = {}
+        self._memoize = {}
+        self._migrations = {}
+        self._migration_chains = {}
+        self._memo_caches = {}
+        self._metrics = None
+        self._hooks = ()
+        self._match_counts = {}
+        self._matches_since_reorder = 0
         self._setup_done = False
+        self._output_validator = None
+        self._output_serializer = None
+        self._output_validations = {}
         self.validate_output = validate_output
+        self.validate_output_rate = validate_output_rate
+        self.validate_output_first = validate_output_first
         self.check_for_single_valid_schema = check_for_single_valid_schema
+        self.engine = engine
+        self.adaptive_order = adaptive_order
+        self.adaptive_order_interval = adaptive_order_interval
+        self.fingerprint_cache_size = fingerprint_cache_size
+        self.fingerprint_value_types = fingerprint_value_types
+        self.class_cache = class_cache
+        self.hint_fallback = hint_fallback
+        self.memoize = memoize
+        self.memoize_size = memoize_size
+        self.memoize_ttl = memoize_ttl
+        self.memoize_copy = memoize_copy
+        self.collect_metrics = collect_metrics
+
+    @overload
+    def add_schema(
+        self, model: type[_InputSchema], *, priority_group: str | None = None, version: str | None = None
+    ) -> type[_InputSchema]:
+        ...
+
+    @overload
+    def add_schema(
+        self, model: None = None, *, priority_group: str | None = None, version: str | None = None
+    ) -> Callable[[type[_InputSchema]], type[_InputSchema]]:
+        ...
+
+    def add_schema(
+        self, model: type[_InputSchema] | None = None, *, priority_group: str | None = None, version: str | None = None
+    ) -> type[_InputSchema] | Callable[[type[_InputSchema]], type[_InputSchema]]:
+        """
+        Register input schema, could be used as a decorator with or without arguments.
+        Schemas with the same `priority_group` could be tried in any order with `adaptive_order`,
+        i.e. the group declares that it doesn't matter which of them is selected if several are valid.
+        `version` tags the schema for `build(schema_hint=...)`.
+        """
+        if model is None:
+            return lambda model: self.add_schema(model, priority_group=priority_group, version=version)
+
+        self._check_not_set_up(f'schema {model.__name__}')
+        if version is not None and self._versions.get(version, model) is not model:
+            msg = f'Version "{version}" is already registered for the schema {self._versions[version].__name__}'
+            raise SetupError(msg)
 
-    def add_schema(self, model: type[_InputSchema]) -> type[_InputSchema]:
         self._storage[model] = None
+        if priority_group is not None:
+            self._priority_groups[model] = priority_group
+        if version is not None:
+            self._versions[version] = model
         return model
 
+    @overload
+    def add_builder(  # type: ignore[overload-overlap]
+        self, builder_func: Callable[[_InputSchema], Awaitable[_OutputType]], *, memoize: bool | None = None
+    ) -> Callable[[_InputSchema], Awaitable[_OutputType]]:
+        """Register async builder, which could be used only with abuild() and abuild_many()"""
+        ...
+
+    @overload
     def add_builder(
-        self, builder_func: Callable[[_InputSchema], _OutputType]
+        self, builder_func: Callable[[_InputSchema], _OutputType], *, memoize: bool | None = None
     ) -> Callable[[_InputSchema], _OutputType]:
+        ...
+
+    @overload
+    def add_builder(self, builder_func: None = None, *, memoize: bool | None = None) -> Callable[[_Builder], _Builder]:
+        ...
+
+    def add_builder(
+        self,
+        builder_func: Callable[[_InputSchema], _OutputType | Awaitable[_OutputType]] | None = None,
+        *,
+        memoize: bool | None = None,
+    ) -> Callable[[_InputSchema], _OutputType | Awaitable[_OutputType]] | Callable[[_Builder], _Builder]:
+        """
+        Register builder, could be used as a decorator with or without arguments.
+        `memoize` overrides the registry `memoize` option for this builder,
+        enable it only for pure builders, which always return the same output for equal inputs.
+        """
+        if builder_func is None:
+            return lambda builder_func: self.add_builder(builder_func, memoize=memoize)  # type: ignore[return-value]
+
+        self._check_not_set_up(f'builder "{builder_func.__name__}"')
         builder_type_hints = get_type_hints(builder_func)
         sign = inspect.signature(builder_func)
 
@@ -78,93 +287,995 @@ class SchemaRegistry(Generic[_OutputType]):
             )
             raise SetupError(msg)
 
-        builder_func = cast(Callable[[BaseModel], _OutputType], builder_func)
+        builder_func = cast(Callable[[BaseModel], Union[_OutputType, Awaitable[_OutputType]]], builder_func)
 
         self._storage[model] = builder_func
+        if memoize is None:
+            self._memoize.pop(model, None)
+        else:
+            self._memoize[model] = memoize
         return builder_func
 
-    def setup(self) -> None:
-        for path in self._discovery_paths:
-            import_string(path)
+    def add_migration(self, migration_func: _Migration) -> _Migration:
+        """
+        Register migration from one input schema to another, could be used as a decorator.
+        Schemas without builders are migrated along the shortest chain of migrations to a schema with builder,
+        the chains are composed with the builders into single callables in setup().
+        """
+        self._check_not_set_up(f'migration "{migration_func.__name__}"')
+        migration_type_hints = get_type_hints(migration_func)
+        parameters = list(inspect.signature(migration_func).parameters.values())
+
+        if len(parameters) != 1:
+            msg = f'Migration "{migration_func.__name__}" must have a single argument for the input data'
+            raise SetupError(msg)
 
-        if any(builder is None for builder in self._storage.values()):
-            schema_without_builders = ', '.join(s.__name__ for s, b in self._storage.items() if b is None)
+        if inspect.iscoroutinefunction(migration_func):
+            msg = f'Migration "{migration_func.__name__}" must be a sync function'
+            raise SetupError(msg)
+
+        models = [migration_type_hints.get(parameters[0].name), migration_type_hints.get('return')]
+        for model in models:
+            if model not in self._storage:
+                msg = f'Migration "{migration_func.__name__}" must be annotated with registered schemas, got {model!r}'
+                raise SetupError(msg)
+        source, target = cast(List[Type[BaseModel]], models)
+
+        if source is target:
+            msg = f'Migration "{migration_func.__name__}" must return a different schema'
+            raise SetupError(msg)
+
+        self._migrations.setdefault(source, {})[target] = migration_func
+        return migration_func
+
+    def _check_not_set_up(self, name: str) -> None:
+        """Compiled dispatch structures are read by concurrent builds without locks, so they must not change"""
+
+        if self._setup_done:
+            msg = f'Attempt to register {name} after setup(), all schemas and builders must be registered before it'
+            raise SetupError(msg)
+
+    def setup(self, *, warm: bool = False) -> None:
+        """
+        Load `discovery_paths` and compile dispatch structures.
+        With `warm=True` validators of all schemas, of their union and of the batches, and the output serializer
+        are built eagerly, including schemas with `defer_build` or forward references, so the first builds are not slower.
+        Call it before forking worker processes, so they share the compiled validators.
+        """
+        self._import_times = discover(self._discovery_paths, self._discovery_manifest)
+
+        chains = migration_chains(self._migrations, [model for model, b in self._storage.items() if b is not None])
+        if any(builder is None and model not in chains for model, builder in self._storage.items()):
+            schema_without_builders = ', '.join(
+                s.__name__ for s, b in self._storage.items() if b is None and s not in chains
+            )
             msg = f'Missing builders for the following schema: {schema_without_builders}'
             raise SetupError(msg)
+
+        self._models = tuple(self._storage)
+        self._migration_chains = chains
+        self._builders = MappingProxyType(
+            {
+                model: self._compose_chain(model) if builder is None else builder
+                for model, builder in self._storage.items()
+            }
+        )
+        if warm:
+            self._rebuild_models()
+        self._async_models = frozenset(m for m, b in self._builders.items() if inspect.iscoroutinefunction(b))
+        self._order = self._models
+        self._positions = {model: i for i, model in enumerate(self._models)}
+        self._index = DiscriminatorIndex(self._order)
+        self._required_keys = RequiredKeysFilter(self._models)
+        # quadratic in the number of schemas, so it's computed only if needed
+        self._overlap = OverlapMatrix(self._models) if self.check_for_single_valid_schema or self.class_cache else None
+        self._fingerprint_cache = (
+            FingerprintCache(self.fingerprint_cache_size, value_types=self.fingerprint_value_types)
+            if self.fingerprint_cache_size > 0
+            else None
+        )
+        self._class_cache = ClassCache() if self.class_cache else None
+        # strict schemas accept only dicts, model_validate() calls a custom `__init__` for dicts only
+        self._dict_only_models = any(
+            model.model_config.get('strict', False) or model.__init__ is not BaseModel.__init__
+            for model in self._models
+        )
+        self._leading = self._leading_models()
+        self._union_adapter = union_adapter(self._models) if warm else None  # compiled on the first use otherwise
+        self._batch_adapter = batch_adapter(self._models) if warm else None  # compiled on the first batch otherwise
+
+        if self.memoize_size < 1:
+            msg = f'memoize_size must be positive, got {self.memoize_size}'
+            raise SetupError(msg)
+        self._memo_caches = {
+            model: MemoCache(self.memoize_size, self.memoize_ttl, copy_output=self.memoize_copy)
+            for model in self._models
+            if self._memoize.get(model, self.memoize)
+        }
+        self._metrics = RegistryMetrics(self._models) if self.collect_metrics else None
+
+        if not 0 <= self.validate_output_rate <= 1:
+            msg = f'validate_output_rate must be between 0 and 1, got {self.validate_output_rate}'
+            raise SetupError(msg)
+        if self.validate_output and self._output_validator is None:
+            self._output_validator = OutputValidator(self._output_type)
+        self._output_serializer = None  # compiled on the first build_dump() or build_json_bytes()
+        if warm:
+            with suppress(PydanticSchemaGenerationError, PydanticUndefinedAnnotation):
+                self._output_serializer = OutputSerializer(self._output_type)
+
         self._setup_done = True
 
+    def _compose_chain(self, model: type[BaseModel]) -> Callable[[BaseModel], _OutputType | Awaitable[_OutputType]]:
+        chain = self._migration_chains[model]
+        builder = self._storage[chain[-1]]
+        assert builder is not None
+        return compose([self._migrations[source][target] for source, target in zip(chain, chain[1:])], builder)
+
+    def _rebuild_models(self) -> None:
+        """Build validators and serializers of the schemas, which pydantic would build on the first use"""
+
+        for model in self._models:
+            if model.__pydantic_complete__:
+                continue
+            try:
+                model.model_rebuild()
+            except PydanticUndefinedAnnotation as error:
+                msg = f'Schema "{model.__name__}" has unresolved annotations: {error.message}'
+                raise SetupError(msg) from error
+
     @overload
-    def build(self, *, source_dict: dict[str, Any], source_object: None = None) -> _OutputType:
+    def build(
+        self, *, source_dict: Mapping[str, Any], source_object: None = None, schema_hint: str | None = None
+    ) -> _OutputType:
         """Build output object from dict-like object"""
         ...
 
     @overload
-    def build(self, *, source_object: Any, source_dict: None = None) -> _OutputType:
+    def build(self, *, source_object: Any, source_dict: None = None, schema_hint: str | None = None) -> _OutputType:
         """Build output object from instance using attributes"""
         ...
 
     def build(
         self,
         *,
-        source_dict: dict[str, Any] | None = None,
+        source_dict: Mapping[str, Any] | None = None,
+        source_object: Any | None = None,
+        schema_hint: str | None = None,
+    ) -> _OutputType:
+        """
+        Build output object from mapping or instance using attributes.
+        `schema_hint` is the version of the input schema, if it's known, e.g. from a header:
+        only the schema registered with this version is validated, see `hint_fallback`.
+        Raises:
+            NoMatchingSchemaError: if no input schema was matched
+            MultipleValidSchemasError: if more than one input schema was matched
+            ValidateOutputError: if output validation failed
+        """
+        assert self._setup_done, 'setup() method must be called before building'
+        assert (source_dict is None) ^ (source_object is None), 'Use either `source_dict` or `source_object` arguments'
+
+        try:
+            if not self._hooks:
+                model, obj = self._select(source_dict, source_object, schema_hint)
+                return self._build_output(model, obj)
+            with span(self._hooks, 'build'):
+                model, obj = self._select(source_dict, source_object, schema_hint)
+                return self._build_output(model, obj)
+        except BuildError as error:
+            if self._metrics is not None:
+                self._metrics.error(error)
+            raise
+
+    def build_dump(
+        self,
+        *,
+        source_dict: Mapping[str, Any] | None = None,
         source_object: Any | None = None,
+        schema_hint: str | None = None,
+        mode: Literal['python', 'json'] = 'python',
+    ) -> Any:
+        """
+        Build output object and dump it with the serializer compiled once, on the first call or in setup(warm=True),
+        `mode='json'` returns only JSON-compatible types, like `model_dump(mode='json')`.
+        Raises the same errors as build(), and OutputValidationError if the output can't be serialized.
+        """
+        output = self.build(source_dict=source_dict, source_object=source_object, schema_hint=schema_hint)
+        return self._serialize(lambda serializer: serializer.to_python(output, mode=mode))
+
+    def build_json_bytes(
+        self,
+        *,
+        source_dict: Mapping[str, Any] | None = None,
+        source_object: Any | None = None,
+        schema_hint: str | None = None,
+    ) -> bytes:
+        """Build output object and serialize it to JSON with the compiled serializer, see build_dump()"""
+
+        output = self.build(source_dict=source_dict, source_object=source_object, schema_hint=schema_hint)
+        return self._serialize(lambda serializer: serializer.to_json(output))  # type: ignore[no-any-return]
+
+    def _serialize(self, serialize: Callable[[OutputSerializer], Any]) -> Any:
+        try:
+            if self._output_serializer is None:
+                self._output_serializer = OutputSerializer(self._output_type)
+            return serialize(self._output_serializer)
+        except (PydanticSchemaGenerationError, PydanticUndefinedAnnotation) as error:
+            msg = f'Output type {self._output_type!r} is not supported by pydantic: {error.message}'
+            if self._metrics is not None:
+                self._metrics.error(OutputValidationError(msg))
+            raise OutputValidationError(msg) from error
+        except PydanticSerializationError as error:
+            if self._metrics is not None:
+                self._metrics.error(OutputValidationError())
+            raise OutputValidationError from error
+
+    @overload
+    async def abuild(
+        self,
+        *,
+        source_dict: Mapping[str, Any],
+        source_object: None = None,
+        schema_hint: str | None = None,
+        offload_validation: bool = False,
+    ) -> _OutputType:
+        """Build output object from dict-like object, awaiting async builders"""
+        ...
+
+    @overload
+    async def abuild(
+        self,
+        *,
+        source_object: Any,
+        source_dict: None = None,
+        schema_hint: str | None = None,
+        offload_validation: bool = False,
+    ) -> _OutputType:
+        """Build output object from instance using attributes, awaiting async builders"""
+        ...
+
+    async def abuild(
+        self,
+        *,
+        source_dict: Mapping[str, Any] | None = None,
+        source_object: Any | None = None,
+        schema_hint: str | None = None,
+        offload_validation: bool = False,
     ) -> _OutputType:
         """
-        Build output object from dict or instance using attributes.
+        Build output object from mapping or instance using attributes, works with both sync and async builders.
+        With `offload_validation=True` input validation runs in the default executor of the event loop,
+        which is useful for large inputs.
         Raises:
             NoMatchingSchemaError: if no input schema was matched
+            MultipleValidSchemasError: if more than one input schema was matched
             ValidateOutputError: if output validation failed
         """
         assert self._setup_done, 'setup() method must be called before building'
         assert (source_dict is None) ^ (source_object is None), 'Use either `source_dict` or `source_object` arguments'
 
-        valid_input_objects: list[tuple[type[BaseModel], BaseModel]] = []
+        try:
+            with span(self._hooks, 'build'):
+                if offload_validation:
+                    loop = asyncio.get_running_loop()
+                    model, obj = await loop.run_in_executor(
+                        None, self._select, source_dict, source_object, schema_hint
+                    )
+                else:
+                    model, obj = self._select(source_dict, source_object, schema_hint)
+
+                output = await self._call_async_builder(model, obj)
+                return self._process_output(model, output)
+        except BuildError as error:
+            if self._metrics is not None:
+                self._metrics.error(error)
+            raise
+
+    async def _call_async_builder(self, model: type[BaseModel], obj: BaseModel) -> _OutputType:
+        builder = self._builders[model]
+        start = time.perf_counter()
+
+        with span(self._hooks, 'builder', model):
+            cache = self._memo_caches.get(model)
+            key = None if cache is None else memo_key(obj)
+            output = MISSING if cache is None or key is None else cache.get(key)
+            if output is MISSING:
+                output = builder(obj)
+                if model in self._async_models:
+                    output = await cast(Awaitable[_OutputType], output)
+                if cache is not None and key is not None:
+                    cache.put(key, output)
+
+        if self._metrics is not None:
+            self._metrics.observe(model, 'builder', time.perf_counter() - start)
+        return cast(_OutputType, output)
+
+    @overload
+    async def abuild_many(
+        self,
+        *,
+        source_dicts: Iterable[Mapping[str, Any]],
+        source_objects: None = None,
+        concurrency: int = 10,
+        offload_validation: bool = False,
+    ) -> list[_OutputType | BuildError]:
+        """Build output objects from dict-like objects, awaiting async builders"""
+        ...
+
+    @overload
+    async def abuild_many(
+        self,
+        *,
+        source_objects: Iterable[Any],
+        source_dicts: None = None,
+        concurrency: int = 10,
+        offload_validation: bool = False,
+    ) -> list[_OutputType | BuildError]:
+        """Build output objects from instances using attributes, awaiting async builders"""
+        ...
+
+    async def abuild_many(
+        self,
+        *,
+        source_dicts: Iterable[Mapping[str, Any]] | None = None,
+        source_objects: Iterable[Any] | None = None,
+        concurrency: int = 10,
+        offload_validation: bool = False,
+    ) -> list[_OutputType | BuildError]:
+        """
+        Build output objects for the batch of dicts or instances using attributes,
+        running at most `concurrency` builds at the same time.
+        Returns outputs in the order of the inputs, with BuildError instances instead of outputs for failed inputs.
+        """
+        assert (source_dicts is None) ^ (source_objects is None), 'Use either `source_dicts` or `source_objects`'
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def build_one(
+            source_dict: Mapping[str, Any] | None, source_object: Any | None
+        ) -> _OutputType | BuildError:
+            async with semaphore:
+                try:
+                    if source_dict is not None:
+                        return await self.abuild(source_dict=source_dict, offload_validation=offload_validation)
+                    return await self.abuild(source_object=source_object, offload_validation=offload_validation)
+                except BuildError as error:
+                    return error
+
+        if source_dicts is not None:
+            tasks = [build_one(source_dict, None) for source_dict in source_dicts]
+        elif source_objects is not None:
+            tasks = [build_one(None, source_object) for source_object in source_objects]
+        else:
+            assert False
+
+        return list(await asyncio.gather(*tasks))
+
+    def add_hook(self, hook: _Hook) -> _Hook:
+        """Register hook called around the build phases, see `BuildHook`"""
+        self._hooks = (*self._hooks, hook)
+        return hook
+
+    def remove_hook(self, hook: BuildHook) -> None:
+        self._hooks = tuple(h for h in self._hooks if h is not hook)
+
+    @property
+    def import_times(self) -> dict[str, float]:
+        """Import duration in seconds of each module loaded from `discovery_paths`, the slowest first"""
+        return dict(sorted(self._import_times.items(), key=lambda item: item[1], reverse=True))
+
+    @property
+    def migration_chains(self) -> dict[type[BaseModel], tuple[type[BaseModel], ...]]:
+        """Schemas built by migrations: chain of schemas from each of them to the schema with builder"""
+        assert self._setup_done, 'setup() method must be called before'
+        return dict(self._migration_chains)
+
+    @property
+    def wrong_hints(self) -> dict[str, int]:
+        """
+        Number of `schema_hint` values, which didn't match the tagged schema, by the version,
+        unknown hints are counted together as `'<unknown>'`
+        """
+        return dict(self._wrong_hints)
+
+    @property
+    def schema_order(self) -> tuple[type[BaseModel], ...]:
+        """Current order of schemas tried by the loop engine"""
+        assert self._setup_done, 'setup() method must be called before'
+        return self._order
+
+    @property
+    def match_counts(self) -> dict[type[BaseModel], int]:
+        """Number of inputs matched to each schema, counted with `adaptive_order`"""
+        return dict(self._match_counts)
+
+    @property
+    def builder_cache_info(self) -> dict[type[BaseModel], CacheInfo]:
+        """Hits and misses of the memoized builders by their input schema"""
+        assert self._setup_done, 'setup() method must be called before'
+        return {model: cache.cache_info() for model, cache in self._memo_caches.items()}
+
+    def clear_builder_caches(self) -> None:
+        """Drop outputs and stats of the memoized builders"""
+        for cache in self._memo_caches.values():
+            cache.clear()
+
+    @property
+    def metrics(self) -> RegistryMetrics | None:
+        """
+        Metrics collected with `collect_metrics`, use `snapshot()` or `prometheus()` to read them.
+        Builds in worker processes of `build_many(executor=...)` are not included.
+        """
+        assert self._setup_done, 'setup() method must be called before'
+        return self._metrics
+
+    @property
+    def fingerprint_cache_info(self) -> CacheInfo | None:
+        """Hits and misses of the schema predicted by the key set of `source_dict`, if the cache is enabled"""
+        assert self._setup_done, 'setup() method must be called before'
+        return None if self._fingerprint_cache is None else self._fingerprint_cache.cache_info()
+
+    @property
+    def class_cache_info(self) -> CacheInfo | None:
+        """Hits and misses of the schema predicted by the class of `source_object`, if the cache is enabled"""
+        assert self._setup_done, 'setup() method must be called before'
+        return None if self._class_cache is None else self._class_cache.cache_info()
+
+    def _select(
+        self, source_dict: Mapping[str, Any] | None, source_object: Any | None, schema_hint: str | None = None
+    ) -> tuple[type[BaseModel], BaseModel]:
+        if self._dict_only_models and source_dict is not None and not isinstance(source_dict, dict):
+            source_dict = dict(source_dict)
+        if schema_hint is not None:
+            model, obj = self._select_hinted(schema_hint, source_dict, source_object)
+        elif self.engine == 'union':
+            model, obj = self._select_union(source_dict, source_object)
+        else:
+            model, obj = self._select_loop(source_dict, source_object)
 
-        for model in self._storage:
+        if self.adaptive_order:
+            self._count_match(model)
+        for hook in self._hooks:
+            hook.match(model)
+
+        return model, obj
+
+    def _select_hinted(
+        self, schema_hint: str, source_dict: Mapping[str, Any] | None, source_object: Any | None
+    ) -> tuple[type[BaseModel], BaseModel]:
+        """Validate the source against the schema of the hinted version only, falling back to the search if enabled"""
+
+        model = self._versions.get(schema_hint)
+        error = None
+        if model is not None:
+            validate = self._measured(lambda hinted_model: self._validate(hinted_model, source_dict, source_object))
             try:
-                if source_dict is not None:
-                    obj = model(**source_dict)
-                elif source_object is not None:
-                    obj = model.model_validate(source_object, from_attributes=True)
+                return model, validate(model)
+            except ValidationError as validation_error:
+                error = validation_error
+
+        counted_hint = schema_hint if model is not None else '<unknown>'  # clients can't grow the counters unboundedly
+        self._wrong_hints[counted_hint] = self._wrong_hints.get(counted_hint, 0) + 1
+        if self.hint_fallback:
+            if self.engine == 'union':
+                return self._select_union(source_dict, source_object)
+            return self._select_loop(source_dict, source_object)
+        if model is None or error is None:
+            raise NoMatchingSchemaError()
+        raise no_matching_schema_error([(model, error)])
+
+    def _count_match(self, model: type[BaseModel]) -> None:
+        self._match_counts[model] = self._match_counts.get(model, 0) + 1
+        self._matches_since_reorder += 1
+        if self._matches_since_reorder >= self.adaptive_order_interval:
+            self._matches_since_reorder = 0
+            self._reorder()
+
+    def _reorder(self) -> None:
+        """
+        Try the most frequently matched schemas first.
+        The selected schema doesn't depend on the order if `check_for_single_valid_schema` is enabled,
+        otherwise schemas are reordered only within their priority groups.
+        """
+        groups = dict.fromkeys(self._models, '') if self.check_for_single_valid_schema else self._priority_groups
+        self._order = reorder_by_counts(self._models, self._match_counts, groups)
+        self._index.reorder(self._order)
+        self._leading = self._leading_models()
+
+    def _leading_models(self) -> frozenset[type[BaseModel]]:
+        if self._class_cache is None:
+            return frozenset()
+        groups = None if self.check_for_single_valid_schema else self._priority_groups
+        return leading(self._order, groups, self._overlap_matrix())
+
+    def _overlap_matrix(self) -> OverlapMatrix:
+        if self._overlap is None:
+            self._overlap = OverlapMatrix(self._models)
+        return self._overlap
+
+    def build_json(self, data: str | bytes) -> _OutputType:
+        """
+        Build output object from JSON document, parsing and validating it in a single pass.
+        Raises:
+            NoMatchingSchemaError: if no input schema was matched, including invalid JSON
+            MultipleValidSchemasError: if more than one input schema was matched
+            ValidateOutputError: if output validation failed
+        """
+        assert self._setup_done, 'setup() method must be called before building'
+
+        try:
+            with span(self._hooks, 'build'):
+                position, obj = self._validate_union(lambda adapter: adapter.validate_json(data))
+
+                if self.check_for_single_valid_schema:
+                    self._check_no_other_valid_schema(
+                        self._models[position],
+                        self._models[position + 1 :],
+                        self._measured(lambda other_model: other_model.model_validate_json(data)),
+                        mapping=True,  # valid JSON for a model is always an object
+                    )
+                for hook in self._hooks:
+                    hook.match(self._models[position])
+
+                return self._build_output(self._models[position], obj)
+        except BuildError as error:
+            if self._metrics is not None:
+                self._metrics.error(error)
+            raise
+
+    @overload
+    def build_many(
+        self,
+        *,
+        source_dicts: Iterable[Mapping[str, Any]],
+        source_objects: None = None,
+        executor: Executor | None = None,
+        chunk_size: int = 1000,
+    ) -> list[_OutputType | BuildError]:
+        """Build output objects from dict-like objects"""
+        ...
+
+    @overload
+    def build_many(
+        self,
+        *,
+        source_objects: Iterable[Any],
+        source_dicts: None = None,
+        executor: Executor | None = None,
+        chunk_size: int = 1000,
+    ) -> list[_OutputType | BuildError]:
+        """Build output objects from instances using attributes"""
+        ...
+
+    def build_many(
+        self,
+        *,
+        source_dicts: Iterable[Mapping[str, Any]] | None = None,
+        source_objects: Iterable[Any] | None = None,
+        executor: Executor | None = None,
+        chunk_size: int = 1000,
+    ) -> list[_OutputType | BuildError]:
+        """
+        Build output objects for the batch of dicts or instances using attributes.
+        The whole batch is validated in a single pydantic-core call, the batch validator is compiled on the first call.
+        Returns outputs in the order of the inputs, with BuildError instances instead of outputs for failed inputs.
+
+        With `executor`, e.g. `ProcessPoolExecutor`, the batch is split into chunks of `chunk_size` built in parallel.
+        Workers import the registry by `import_path` and call `setup()`, so inputs and outputs must be picklable.
+        """
+        assert self._setup_done, 'setup() method must be called before building'
+        assert (source_dicts is None) ^ (source_objects is None), 'Use either `source_dicts` or `source_objects`'
+
+        if source_dicts is not None:
+            sources, from_attributes = list(source_dicts), False
+            if self._dict_only_models:
+                sources = [s if isinstance(s, dict) else dict(s) for s in sources]
+        elif source_objects is not None:
+            sources, from_attributes = list(source_objects), True
+        else:
+            assert False
+
+        if executor is not None:
+            return self._build_many_parallel(executor, sources, from_attributes=from_attributes, chunk_size=chunk_size)
+
+        if self._batch_adapter is None:
+            self._batch_adapter = batch_adapter(self._models)
+        matches: list[tuple[int, BaseModel] | None]
+        if self._batch_adapter is None:
+            matches = [None] * len(sources)
+        else:
+            matches = self._batch_adapter.validate_python(sources, from_attributes=from_attributes)
+
+        return [
+            self._build_matched(source, match, from_attributes=from_attributes)
+            for source, match in zip(sources, matches)
+        ]
+
+    def _build_matched(
+        self, source: Any, match: tuple[int, BaseModel] | None, *, from_attributes: bool
+    ) -> _OutputType | BuildError:
+        """Build output for the input validated as a part of the batch, returns BuildError instead of raising it"""
+
+        if self._metrics is not None:
+            self._metrics.union_attempt(self._models, None if match is None else match[0], None)
+
+        try:
+            if match is None:
+                raise NoMatchingSchemaError()
+
+            position, obj = match
+            if self.check_for_single_valid_schema:
+                if from_attributes:
+                    self._check_no_other_valid_source_schema(position, None, source)
                 else:
-                    assert False
-            except ValidationError:
+                    self._check_no_other_valid_source_schema(position, source, None)
+            for hook in self._hooks:
+                hook.match(self._models[position])
+            return self._build_output(self._models[position], obj)
+        except BuildError as error:
+            if self._metrics is not None:
+                self._metrics.error(error)
+            return error
+
+    def _build_many_parallel(
+        self, executor: Executor, sources: list[Any], *, from_attributes: bool, chunk_size: int
+    ) -> list[_OutputType | BuildError]:
+        if self._import_path is None:
+            msg = 'import_path is required to build in the worker processes'
+            raise SetupError(msg)
+
+        chunks = [sources[i : i + chunk_size] for i in range(0, len(sources), chunk_size)]
+        results: list[_OutputType | BuildError] = []
+        for chunk_results in executor.map(_build_chunk, repeat(self._import_path), chunks, repeat(from_attributes)):
+            results.extend(chunk_results)
+        return results
+
+    def build_iter(
+        self,
+        source: LinesSource,
+        *,
+        chunk_size: int | None = None,
+        on_error: Callable[[int, str | bytes, BuildError], None] | None = None,
+    ) -> Iterator[tuple[int, _OutputType | BuildError]]:
+        """
+        Lazily build output objects from newline-delimited JSON.
+        `source` could be a file path, a binary file object or an iterable of lines as `str` or `bytes`.
+        Yields pairs of the line index (blank lines are skipped) and the output or BuildError for the failed line.
+        If `on_error` callback is provided, failed lines are passed to it instead of being yielded.
+        """
+        assert self._setup_done, 'setup() method must be called before building'
+
+        for index, line in enumerate(iter_lines(source, chunk_size)):
+            if not line.strip():
                 continue
+            try:
+                output = self.build_json(line)
+            except BuildError as error:
+                if on_error is None:
+                    yield index, error
+                else:
+                    on_error(index, line, error)
+            else:
+                yield index, output
+
+    def _build_output(self, model: type[BaseModel], obj: BaseModel) -> _OutputType:
+        builder = self._builders[model]
+        assert model not in self._async_models, f'Builder for "{model.__name__}" is async, use abuild() instead'
+
+        if self._metrics is None and not self._hooks:
+            return self._process_output(model, self._call_builder(model, builder, obj))
+
+        start = time.perf_counter()
+        with span(self._hooks, 'builder', model):
+            output = self._call_builder(model, builder, obj)
+        if self._metrics is not None:
+            self._metrics.observe(model, 'builder', time.perf_counter() - start)
+        return self._process_output(model, output)
+
+    def _call_builder(
+        self, model: type[BaseModel], builder: Callable[[BaseModel], Any], obj: BaseModel
+    ) -> _OutputType:
+        cache = self._memo_caches.get(model)
+        key = None if cache is None else memo_key(obj)
+        if cache is None or key is None:
+            return cast(_OutputType, builder(obj))
+
+        output = cache.get(key)
+        if output is MISSING:
+            output = builder(obj)
+            cache.put(key, output)
+        return cast(_OutputType, output)
+
+    def _process_output(self, model: type[BaseModel], output: _OutputType) -> _OutputType:
+        if not (self.validate_output and self._sample_output_validation(model)):
+            return output
 
-            valid_input_objects.append((model, obj))
-            if not self.check_for_single_valid_schema:
-                break  # we already have one suitable input object
+        start = time.perf_counter()
+        try:
+            with span(self._hooks, 'output_validation', model):
+                return self.perform_validate_output(output)
+        except ValidationError as error:
+            raise OutputValidationError from error
+        finally:
+            if self._metrics is not None:
+                self._metrics.observe(model, 'output_validation', time.perf_counter() - start)
 
-        if not valid_input_objects:
+    def _select_loop(
+        self, source_dict: Mapping[str, Any] | None, source_object: Any | None
+    ) -> tuple[type[BaseModel], BaseModel]:
+        """Reference engine: validate the source against candidate schemas one by one"""
+
+        validate = self._measured(lambda model: self._validate(model, source_dict, source_object))
+        source_class = None
+        if self._class_cache is not None and source_object is not None and not isinstance(source_object, Mapping):
+            source_class = type(source_object)
+            match = self._select_by_class(source_class, source_object, validate)
+            if match is not None:
+                return match
+
+        candidates = self._candidates(source_dict, source_object)
+
+        fingerprint = hint = None
+        if self._fingerprint_cache is not None and source_dict is not None:
+            fingerprint = self._fingerprint_cache.fingerprint(source_dict)
+            hint = self._fingerprint_cache.get(fingerprint)
+            if hint is not None:
+                groups = None if self.check_for_single_valid_schema else self._priority_groups
+                candidates = promote(candidates, hint, groups)
+
+        failures: list[tuple[type[BaseModel], ValidationError]] | None = None  # allocated on the first failure only
+        for i, model in enumerate(candidates):
+            try:
+                obj = validate(model)
+            except ValidationError as error:
+                if failures is None:
+                    failures = []
+                failures.append((model, error))
+                continue
+
+            if self.check_for_single_valid_schema:
+                self._check_no_other_valid_schema(
+                    model, candidates[i + 1 :], validate, mapping=_is_mapping(source_dict, source_object)
+                )
+            self._remember_match(model, fingerprint, hint, source_class)
+            return model, obj
+
+        raise no_matching_schema_error(failures or (), self._excluded(candidates, source_dict, source_object))
+
+    def _remember_match(
+        self,
+        model: type[BaseModel],
+        fingerprint: Hashable | None,
+        hint: type[BaseModel] | None,
+        source_class: type | None,
+    ) -> None:
+        if fingerprint is not None:
+            assert self._fingerprint_cache is not None
+            self._fingerprint_cache.put(fingerprint, model, hit=model is hint)
+        if source_class is not None:
+            assert self._class_cache is not None
+            self._class_cache.put(source_class, model, hit=False)
+
+    def _select_by_class(
+        self, source_class: type, source_object: Any, validate: Callable[[type[BaseModel]], BaseModel]
+    ) -> tuple[type[BaseModel], BaseModel] | None:
+        """
+        Validate the object against the schema matched for its class before, without searching the candidates.
+        Returns None if there is no such schema, it could change the first valid schema or the object is invalid for it.
+        """
+
+        assert self._class_cache is not None
+        model = self._class_cache.get(source_class)
+        if model is None:
+            return None
+        if model not in self._leading:
+            return None  # other schemas must be tried first
+
+        try:
+            obj = validate(model)
+        except ValidationError:
+            return None
+
+        if self.check_for_single_valid_schema and self._overlap_matrix().overlapping(model, mapping=False):
+            others = [m for m in self._candidates(None, source_object) if m is not model]
+            self._check_no_other_valid_schema(model, others, validate, mapping=False)
+        self._class_cache.put(source_class, model, hit=True)
+        return model, obj
+
+    def _select_union(
+        self, source_dict: Mapping[str, Any] | None, source_object: Any | None
+    ) -> tuple[type[BaseModel], BaseModel]:
+        """Validate the source with the union validator, in a single pydantic-core call"""
+
+        if source_dict is not None:
+            position, obj = self._validate_union(lambda adapter: adapter.validate_python(source_dict))
+        else:
+            position, obj = self._validate_union(
+                lambda adapter: adapter.validate_python(source_object, from_attributes=True)
+            )
+
+        if self.check_for_single_valid_schema:
+            self._check_no_other_valid_source_schema(position, source_dict, source_object)
+
+        return self._models[position], obj
+
+    def _validate_union(
+        self, validate: Callable[[TypeAdapter[tuple[int, BaseModel]]], tuple[int, BaseModel]]
+    ) -> tuple[int, BaseModel]:
+        """Validate the input with the union adapter, returns the matched schema position and validated object"""
+
+        if self._union_adapter is None:
+            self._union_adapter = union_adapter(self._models)
+        if self._union_adapter is None:
             raise NoMatchingSchemaError()
 
-        elif len(valid_input_objects) > 1 and self.check_for_single_valid_schema:
+        metrics = self._metrics
+        start = time.perf_counter()
+        try:
+            with span(self._hooks, 'attempt', None):
+                position, obj = validate(self._union_adapter)
+        except ValidationError as error:
+            if metrics is not None:
+                metrics.union_attempt(self._models, None, None)
+            raise union_no_matching_schema_error(self._models, error) from None
+
+        if metrics is not None:
+            metrics.union_attempt(self._models, position, time.perf_counter() - start)
+        return position, obj
+
+    def _check_no_other_valid_source_schema(
+        self, position: int, source_dict: Mapping[str, Any] | None, source_object: Any | None
+    ) -> None:
+        """Left-to-right union already rejected all the schemas before the matched one, so only the rest are checked"""
+
+        self._check_no_other_valid_schema(
+            self._models[position],
+            [m for m in self._candidates(source_dict, source_object) if self._positions[m] > position],
+            self._measured(lambda other_model: self._validate(other_model, source_dict, source_object)),
+            mapping=_is_mapping(source_dict, source_object),
+        )
+
+    def _check_no_other_valid_schema(
+        self,
+        model: type[BaseModel],
+        others: Sequence[type[BaseModel]],
+        validate: Callable[[type[BaseModel]], BaseModel],
+        *,
+        mapping: bool,
+    ) -> None:
+        """
+        Raise MultipleValidSchemasError if any of `others` is valid too.
+        Schemas, which can't overlap with the matched one according to the static analysis, are not validated.
+        """
+
+        overlapping = self._overlap_matrix().overlapping(model, mapping=mapping)
+        for other_model in others:
+            if other_model not in overlapping:
+                continue
+            try:
+                validate(other_model)
+            except ValidationError:
+                continue
             raise MultipleValidSchemasError()
 
+    def _measured(self, validate: Callable[[type[BaseModel]], BaseModel]) -> Callable[[type[BaseModel]], BaseModel]:
+        """Record attempts and durations of the input validation in metrics and hooks, if there are any"""
+
+        metrics = self._metrics
+        hooks = self._hooks
+        if metrics is None and not hooks:
+            return validate
+
+        def measured(model: type[BaseModel]) -> BaseModel:
+            start = time.perf_counter()
+            try:
+                with span(hooks, 'attempt', model):
+                    obj = validate(model)
+            except ValidationError:
+                if metrics is not None:
+                    metrics.attempt(model, time.perf_counter() - start, matched=False)
+                raise
+            if metrics is not None:
+                metrics.attempt(model, time.perf_counter() - start, matched=True)
+            return obj
+
+        return measured
+
+    @staticmethod
+    def _validate(
+        model: type[BaseModel], source_dict: Mapping[str, Any] | None, source_object: Any | None
+    ) -> BaseModel:
+        if source_dict is not None:
+            return model.model_validate(source_dict)  # any mapping, without copying it into kwargs
+        elif source_object is not None:
+            return model.model_validate(source_object, from_attributes=True)
         else:
-            model, obj = valid_input_objects[0]
-            builder = self._storage[model]
-            assert builder is not None
+            assert False
 
-            output = builder(obj)
+    @property
+    def overlap_matrix(self) -> dict[str, list[str]]:
+        """
+        Qualified names of the schemas, which could be valid for the same mapping as each schema.
+        Only these pairs are validated by `check_for_single_valid_schema`; review them to find ambiguous schemas.
+        """
+        assert self._setup_done, 'setup() method must be called before'
+        return self._overlap_matrix().to_dict()
 
-            if self.validate_output:
-                try:
-                    return self.perform_validate_output(output)
-                except ValidationError as error:
-                    raise OutputValidationError from error
-            else:
-                return output
+    def _candidates(
+        self, source_dict: Mapping[str, Any] | None, source_object: Any | None
+    ) -> Sequence[type[BaseModel]]:
+        """Schemas to try in order, excluding ones the input is guaranteed to be invalid for"""
+
+        if not self._index and not self._required_keys:
+            return self._order
+
+        source = source_dict if source_dict is not None else source_object
+        mapping = source if isinstance(source, Mapping) else None  # validated by keys, even with `from_attributes`
+        # instances of the schemas are accepted as is, their attributes are named by fields, not by aliases
+        model_instance = isinstance(source, BaseModel)
+
+        candidates: Sequence[type[BaseModel]] = self._order
+        if self._index and not model_instance:
+            get_value = dict_getter(mapping) if mapping is not None else attribute_getter(source)
+            candidates = self._index.candidates(get_value)
+        if self._required_keys and not model_instance:
+            keys = mapping.keys() if mapping is not None else self._required_keys.present_attributes(source)
+            candidates = self._required_keys.filter(candidates, keys)
+        return candidates
+
+    def _excluded(
+        self, candidates: Sequence[type[BaseModel]], source_dict: Mapping[str, Any] | None, source_object: Any | None
+    ) -> Iterator[tuple[type[BaseModel], list[tuple[tuple[int | str, ...], str]]]]:
+        """
+        Schemas excluded from `candidates` with the errors they are guaranteed to have, for diagnostics only.
+        Generated lazily, so only the schemas summarized by the error are checked.
+        """
+
+        if len(candidates) == len(self._order):
+            return
+
+        source = source_dict if source_dict is not None else source_object
+        mapping = source if isinstance(source, Mapping) else None
+        get_value = dict_getter(mapping) if mapping is not None else attribute_getter(source)
+        keys = mapping.keys() if mapping is not None else self._required_keys.present_attributes(source)
+        kept = set(candidates)
+        for model in self._order:
+            if model in kept:
+                continue
+            errors = excluded_errors(self._required_keys.missing(model, keys), self._index.rejected(model, get_value))
+            if errors:
+                yield model, errors
+
+    def _sample_output_validation(self, model: type[BaseModel]) -> bool:
+        """First `validate_output_first` outputs of each builder are validated, others with `validate_output_rate`"""
+
+        if self.validate_output_rate >= 1:
+            return True
+        if self.validate_output_first:
+            count = self._output_validations.get(model, 0)
+            if count < self.validate_output_first:
+                self._output_validations[model] = count + 1
+                return True
+        return random.random() < self.validate_output_rate  # noqa: S311  # not used for security
 
     def perform_validate_output(self, output: _OutputType) -> _OutputType:
         """Override this method to provide custom output validation."""
 
-        # https://github.com/pydantic/pydantic-core/issues/755
-        data: Any
-        if is_dataclass(self._output_type):
-            data = output.__dict__
-        elif isinstance(output, BaseModel):
-            data = output.model_dump(mode='python')
-        else:
-            data = output
-        return TypeAdapter(self._output_type).validate_python(data)
+        if self._output_validator is None:
+            self._output_validator = OutputValidator(self._output_type)
+        return self._output_validator.validate(output)
+
+
+def _is_mapping(source_dict: Mapping[str, Any] | None, source_object: Any | None) -> bool:
+    return source_dict is not None or isinstance(source_object, Mapping)
+
+
+def _build_chunk(import_path: str, sources: list[Any], from_attributes: bool) -> list[Any | BuildError]:  # noqa: FBT001
+    """Build the chunk of inputs in the worker process"""
+
+    schema_registry: SchemaRegistry[Any] = import_object(import_path)
+    if not schema_registry._setup_done:
+        schema_registry.setup()
+    if from_attributes:
+        return schema_registry.build_many(source_objects=sources)
+    return schema_registry.build_many(source_dicts=sources)
@@ -1,11 +1,144 @@
+from __future__ import annotations
+
+import json
+import os
+import time
 from importlib import import_module
+from os import PathLike
+from pathlib import Path
 from pkgutil import iter_modules
+from types import ModuleType
+from typing import IO, Any, Iterable, Iterator, Sequence, Union, cast
+
+LinesSource = Union[str, 'PathLike[str]', IO[bytes], Iterable[Union[str, bytes]]]
+
+
+_MANIFEST_VERSION = 1
 
 
 def import_string(import_path: str) -> None:
-    module = import_module(import_path)
+    discover([import_path])
+
+
+def discover(import_paths: Sequence[str], manifest_path: str | PathLike[str] | None = None) -> dict[str, float]:
+    """
+    Import modules and packages with all their submodules recursively, returns import duration of each module.
+
+    With `manifest_path` the list of discovered modules is saved to that JSON file along with mtimes of package directories.
+    Next time the modules are imported by the list, packages are walked again only if their directories have changed.
+    """
+
+    manifest = {} if manifest_path is None else _load_manifest(Path(manifest_path))
+    import_times: dict[str, float] = {}
+    changed = False
+
+    for import_path in import_paths:
+        entry = manifest.get(import_path)
+        if entry is not None and _is_fresh(entry['directories']):
+            for module_path in entry['modules']:
+                _import_module(module_path, import_times)
+        else:
+            directories: dict[str, int] = {}
+            modules = _walk(import_path, import_times, directories)
+            manifest[import_path] = {'modules': modules, 'directories': directories}
+            changed = True
+
+    if manifest_path is not None and changed:
+        _save_manifest(Path(manifest_path), manifest)
+    return import_times
+
+
+def _walk(import_path: str, import_times: dict[str, float], directories: dict[str, int]) -> list[str]:
+    module = _import_module(import_path, import_times)
+    modules = [import_path]
 
     if hasattr(module, '__path__'):  # it is a package
+        for directory in module.__path__:
+            directories[directory] = Path(directory).stat().st_mtime_ns  # before listing, so later changes are noticed
         for submodule_info in iter_modules(module.__path__):
-            sub_path = f'{import_path}.{submodule_info.name}'
-            import_string(sub_path)
+            modules += _walk(f'{import_path}.{submodule_info.name}', import_times, directories)
+    return modules
+
+
+def _import_module(import_path: str, import_times: dict[str, float]) -> ModuleType:
+    start = time.perf_counter()
+    module = import_module(import_path)
+    import_times[import_path] = time.perf_counter() - start
+    return module
+
+
+def _is_fresh(directories: dict[str, int]) -> bool:
+    """Modules are added to or removed from the package only with the change of its directory mtime"""
+
+    try:
+        return all(Path(directory).stat().st_mtime_ns == mtime for directory, mtime in directories.items())
+    except OSError:
+        return False
+
+
+def _load_manifest(path: Path) -> dict[str, Any]:
+    try:
+        manifest = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get('version') != _MANIFEST_VERSION:
+        return {}
+    entries = manifest.get('entries')
+    if not isinstance(entries, dict):
+        return {}
+    # malformed entries are walked again, like the ones missing in the manifest
+    return {
+        import_path: entry
+        for import_path, entry in entries.items()
+        if isinstance(entry, dict)
+        and isinstance(entry.get('modules'), list)
+        and isinstance(entry.get('directories'), dict)
+    }
+
+
+def _save_manifest(path: Path, entries: dict[str, Any]) -> None:
+    """Write to a temporary file first, so concurrent processes don't read partially written manifest"""
+
+    temporary_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    temporary_path.write_text(json.dumps({'version': _MANIFEST_VERSION, 'entries': entries}, indent=2))
+    temporary_path.replace(path)
+
+
+def import_object(import_path: str) -> Any:
+    """Import object by the path in `package.module:attribute` format"""
+
+    module_path, _, attribute = import_path.partition(':')
+    return getattr(import_module(module_path), attribute)
+
+
+def schema_name(model: type) -> str:
+    """Qualified name of the schema, so schemas of the same name from different modules are told apart"""
+    return f'{model.__module__}.{model.__qualname__}'
+
+
+def iter_lines(source: LinesSource, chunk_size: int | None = None) -> Iterator[str | bytes]:
+    """
+    Lazily iterate over lines of the file path, binary file object or iterable of lines.
+    With `chunk_size` files are read by chunks of that size instead of lines.
+    """
+
+    if isinstance(source, (str, PathLike)):
+        with Path(source).open('rb') as file:
+            yield from _read_lines(file, chunk_size)
+    elif hasattr(source, 'read'):
+        yield from _read_lines(cast(IO[bytes], source), chunk_size)
+    else:
+        yield from source
+
+
+def _read_lines(file: IO[bytes], chunk_size: int | None) -> Iterator[bytes]:
+    if chunk_size is None:
+        yield from file
+        return
+
+    tail = b''
+    while chunk := file.read(chunk_size):
+        *lines, tail = (tail + chunk).split(b'\n')
+        yield from lines
+    if tail:
+        yield tail
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import pytest
+from pydantic import BaseModel
+
+from schema_overseer_local import MultipleValidSchemasError, SchemaRegistry
+
+
+class LegacyInputFormat(BaseModel):
+    value: str
+
+
+class OldInputFormat(BaseModel):
+    old_value: str
+
+
+class NewInputFormat(BaseModel):
+    new_value: str
+    value: str = 'default'
+
+
+def legacy_builder(data: LegacyInputFormat) -> str:
+    return f'legacy {data.value}'
+
+
+def old_builder(data: OldInputFormat) -> str:
+    return f'old {data.old_value}'
+
+
+def new_builder(data: NewInputFormat) -> str:
+    return f'new {data.new_value}'
+
+
+def test_adaptive_order_within_priority_group() -> None:
+    """Tests that frequently matched schemas are moved forward within their priority group only"""
+
+    schema_registry = SchemaRegistry(str, adaptive_order=True, adaptive_order_interval=5)
+    schema_registry.add_schema(LegacyInputFormat)
+    schema_registry.add_schema(OldInputFormat, priority_group='versions')
+    schema_registry.add_schema(NewInputFormat, priority_group='versions')
+    schema_registry.add_builder(legacy_builder)
+    schema_registry.add_builder(old_builder)
+    schema_registry.add_builder(new_builder)
+    schema_registry.setup()
+    legacy, old, new = schema_registry.schema_order
+
+    for _ in range(5):
+        assert schema_registry.build(source_dict={'new_value': 'a'}) == 'new a'
+
+    assert schema_registry.schema_order == (legacy, new, old)
+    assert schema_registry.match_counts == {new: 5}
+
+    # legacy schema is still the first valid one
+    assert schema_registry.build(source_dict={'value': 'b', 'new_value': 'b'}) == 'legacy b'
+
+
+def test_adaptive_order_ungrouped_schema_between_group_members() -> None:
+    """Tests that schemas of the group are not moved over the ungrouped schema between them"""
+
+    schema_registry = SchemaRegistry(str, adaptive_order=True, adaptive_order_interval=5)
+    schema_registry.add_schema(OldInputFormat, priority_group='versions')
+    schema_registry.add_schema(LegacyInputFormat)
+    schema_registry.add_schema(NewInputFormat, priority_group='versions')
+    schema_registry.add_builder(legacy_builder)
+    schema_registry.add_builder(old_builder)
+    schema_registry.add_builder(new_builder)
+    schema_registry.setup()
+    order = schema_registry.schema_order
+
+    for _ in range(5):
+        assert schema_registry.build(source_dict={'new_value': 'a'}) == 'new a'
+
+    assert schema_registry.schema_order == order
+    assert schema_registry.build(source_dict={'value': 'b', 'new_value': 'b'}) == 'legacy b'
+
+
+def test_adaptive_order_without_priority_groups() -> None:
+    """Tests that schemas are not reordered without priority groups, because the first valid schema could change"""
+
+    schema_registry = SchemaRegistry(str, adaptive_order=True, adaptive_order_interval=5)
+    schema_registry.add_schema(LegacyInputFormat)
+    schema_registry.add_schema(OldInputFormat)
+    schema_registry.add_schema(NewInputFormat)
+    schema_registry.add_builder(legacy_builder)
+    schema_registry.add_builder(old_builder)
+    schema_registry.add_builder(new_builder)
+    schema_registry.setup()
+    order = schema_registry.schema_order
+
+    for _ in range(5):
+        schema_registry.build(source_dict={'new_value': 'a'})
+
+    assert schema_registry.schema_order == order
+
+
+def test_adaptive_order_check_for_single_valid_schema() -> None:
+    """Tests that all schemas are reordered if check_for_single_valid_schema is enabled"""
+
+    schema_registry = SchemaRegistry(
+        str, adaptive_order=True, adaptive_order_interval=5, check_for_single_valid_schema=True
+    )
+    schema_registry.add_schema(LegacyInputFormat)
+    schema_registry.add_schema(OldInputFormat)
+    schema_registry.add_schema(NewInputFormat)
+    schema_registry.add_builder(legacy_builder)
+    schema_registry.add_builder(old_builder)
+    schema_registry.add_builder(new_builder)
+    schema_registry.setup()
+    legacy, old, new = schema_registry.schema_order
+
+    for _ in range(4):
+        schema_registry.build(source_dict={'new_value': 'a'})
+    schema_registry.build(source_dict={'old_value': 'a'})
+
+    assert schema_registry.schema_order == (new, old, legacy)
+    with pytest.raises(MultipleValidSchemasError):
+        schema_registry.build(source_dict={'value': 'b', 'new_value': 'b'})
+
+
+def test_add_schema_decorator_with_priority_group() -> None:
+    """Tests that add_schema could be used as a decorator with arguments"""
+
+    schema_registry = SchemaRegistry(str, adaptive_order=True, adaptive_order_interval=1)
+    assert schema_registry.add_schema(priority_group='versions')(OldInputFormat) is OldInputFormat
+    schema_registry.add_schema(priority_group='versions')(NewInputFormat)
+    schema_registry.add_builder(old_builder)
+    schema_registry.add_builder(new_builder)
+    schema_registry.setup()
+
+    schema_registry.build(source_dict={'new_value': 'a'})
+
+    assert schema_registry.schema_order == (NewInputFormat, OldInputFormat)
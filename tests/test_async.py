@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from schema_overseer_local import NoMatchingSchemaError, OutputValidationError, SchemaRegistry, SetupError
+
+
+@dataclass
+class Output:
+    value: int
+
+
+class OldInputFormat(BaseModel):
+    value: str
+
+
+class NewInputFormat(BaseModel):
+    renamed_value: int
+
+
+schema_registry = SchemaRegistry(Output, validate_output=True)
+schema_registry.add_schema(OldInputFormat)
+schema_registry.add_schema(NewInputFormat)
+
+
+@schema_registry.add_builder
+def old_builder(data: OldInputFormat) -> Output:
+    return Output(value=data.value)  # type: ignore[arg-type]
+
+
+@schema_registry.add_builder
+async def new_builder(data: NewInputFormat) -> Output:
+    await asyncio.sleep(0)
+    return Output(value=data.renamed_value)
+
+
+schema_registry.setup()
+
+
+@pytest.mark.parametrize('offload_validation', [False, True])
+@pytest.mark.parametrize('source', [{'value': '1'}, {'renamed_value': 1}])
+def test_abuild(source: dict[str, Any], offload_validation: bool) -> None:  # noqa: FBT001
+    """Tests that abuild works with both sync and async builders"""
+
+    output = asyncio.run(schema_registry.abuild(source_dict=source, offload_validation=offload_validation))
+
+    assert output == Output(value=1)
+
+
+def test_build_with_async_builder() -> None:
+    """Tests that build can't be used with async builder"""
+
+    with pytest.raises(AssertionError, match='abuild'):
+        schema_registry.build(source_dict={'renamed_value': 1})
+
+
+def test_abuild_many() -> None:
+    """Tests that abuild_many returns outputs and errors in the order of the inputs with limited concurrency"""
+
+    running = 0
+    max_running = 0
+
+    local_registry = SchemaRegistry(Output)
+    local_registry.add_schema(NewInputFormat)
+
+    @local_registry.add_builder
+    async def builder(data: NewInputFormat) -> Output:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return Output(value=data.renamed_value)
+
+    local_registry.setup()
+    results = asyncio.run(
+        local_registry.abuild_many(source_dicts=[{'renamed_value': i} for i in range(10)] + [{}], concurrency=3)
+    )
+
+    assert results[:10] == [Output(value=i) for i in range(10)]
+    assert isinstance(results[10], NoMatchingSchemaError)
+    assert max_running == 3
+
+
+def test_abuild_many_output_validation() -> None:
+    """Tests that output of the async builders is validated"""
+
+    results = asyncio.run(schema_registry.abuild_many(source_objects=[Output(value=1), OldInputFormat(value='a')]))
+
+    assert isinstance(results[0], NoMatchingSchemaError)
+    assert isinstance(results[1], OutputValidationError)
+
+
+def test_async_builder_with_invalid_return_annotation() -> None:
+    """Tests that return type annotation of async builders is checked"""
+
+    local_registry = SchemaRegistry(Output)
+    local_registry.add_schema(NewInputFormat)
+
+    with pytest.raises(SetupError, match='async_builder'):
+
+        @local_registry.add_builder  # type: ignore[arg-type]
+        async def async_builder(data: NewInputFormat) -> int:
+            return data.renamed_value
@@ -105,3 +105,28 @@ def test_extra_arguments_in_builder_is_fine_with_defaults() -> None:
     @schema_registry.add_builder
     def builder_with_extra_args(data: OldInputFormat, extra: str = 'test') -> Output:
         return Output(value='test')
+
+
+def test_registration_after_setup() -> None:
+    """Tests that SetupError is raised at attempt to register schema or builder after setup"""
+
+    local_registry = SchemaRegistry(Output)
+    local_registry.add_schema(OldInputFormat)
+
+    @local_registry.add_builder
+    def old_builder(data: OldInputFormat) -> Output:
+        return Output(value=data.value)
+
+    local_registry.setup()
+
+    with pytest.raises(SetupError, match='NewInputFormat'):
+        local_registry.add_schema(NewInputFormat)
+
+    with pytest.raises(SetupError, match='other_builder'):
+
+        @local_registry.add_builder
+        def other_builder(data: OldInputFormat) -> Output:
+            return Output(value=data.value)
+
+    local_registry.setup()  # compiled again from the same registrations
+    assert local_registry.build(source_dict={'value': 'a'}) == Output(value='a')
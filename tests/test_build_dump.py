@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+from typing import Set
+
+import pytest
+from pydantic import BaseModel
+
+from schema_overseer_local import OutputValidationError, SchemaRegistry
+
+
+class Output(BaseModel):
+    day: date
+    tags: Set[str]  # noqa: UP006
+
+
+class UnsupportedOutput:
+    pass
+
+
+schema_registry = SchemaRegistry(Output)
+validated_registry = SchemaRegistry(Output, validate_output=True)
+
+
+@validated_registry.add_schema
+@schema_registry.add_schema
+class InputFormat(BaseModel):
+    day: str
+
+
+@validated_registry.add_builder
+@schema_registry.add_builder
+def day_builder(data: InputFormat) -> Output:
+    return Output(day=date.fromisoformat(data.day), tags={'a'})
+
+
+schema_registry.setup()
+validated_registry.setup()
+
+
+@pytest.mark.parametrize('schema_registry', [schema_registry, validated_registry])
+def test_build_dump(schema_registry: SchemaRegistry[Output]) -> None:
+    """Tests that outputs are dumped in python and JSON modes"""
+
+    assert schema_registry.build_dump(source_dict={'day': '2024-01-02'}) == {'day': date(2024, 1, 2), 'tags': {'a'}}
+    assert schema_registry.build_dump(source_dict={'day': '2024-01-02'}, mode='json') == {
+        'day': '2024-01-02',
+        'tags': ['a'],
+    }
+
+
+def test_build_json_bytes() -> None:
+    """Tests that outputs are serialized to JSON bytes"""
+
+    output = schema_registry.build_json_bytes(source_dict={'day': '2024-01-02'})
+
+    assert isinstance(output, bytes)
+    assert json.loads(output) == {'day': '2024-01-02', 'tags': ['a']}
+
+
+def test_build_dump_unserializable_output() -> None:
+    """Tests that OutputValidationError is raised if the output can't be serialized"""
+
+    unsupported_registry = SchemaRegistry(object)
+    unsupported_registry.add_schema(InputFormat)
+
+    @unsupported_registry.add_builder
+    def builder(data: InputFormat) -> object:
+        return UnsupportedOutput()
+
+    unsupported_registry.setup()
+
+    with pytest.raises(OutputValidationError):
+        unsupported_registry.build_json_bytes(source_dict={'day': '2024-01-02'})
+
+
+class ForwardRefOutput(BaseModel):
+    child: LaterOutput
+
+
+class LaterOutput(BaseModel):
+    value: str
+
+
+@pytest.mark.parametrize('warm', [False, True])
+def test_build_dump_output_with_forward_references(warm: bool) -> None:  # noqa: FBT001
+    """Tests that the serializer isn't compiled in setup(), so forward references could be resolved later"""
+
+    forward_ref_registry = SchemaRegistry(ForwardRefOutput)
+    forward_ref_registry.add_schema(InputFormat)
+
+    @forward_ref_registry.add_builder
+    def builder(data: InputFormat) -> ForwardRefOutput:
+        return ForwardRefOutput.model_construct(child=LaterOutput(value=data.day))
+
+    forward_ref_registry.setup(warm=warm)
+    ForwardRefOutput.model_rebuild()
+
+    assert forward_ref_registry.build_dump(source_dict={'day': 'a'}) == {'child': {'value': 'a'}}
+
+
+@pytest.mark.parametrize('warm', [False, True])
+def test_build_dump_unsupported_output_type(warm: bool) -> None:  # noqa: FBT001
+    """Tests that OutputValidationError is raised if the serializer can't be compiled for the output type"""
+
+    unsupported_registry = SchemaRegistry(UnsupportedOutput)
+    unsupported_registry.add_schema(InputFormat)
+
+    @unsupported_registry.add_builder
+    def builder(data: InputFormat) -> UnsupportedOutput:
+        return UnsupportedOutput()
+
+    unsupported_registry.setup(warm=warm)
+
+    assert isinstance(unsupported_registry.build(source_dict={'day': '2024-01-02'}), UnsupportedOutput)
+    with pytest.raises(OutputValidationError, match='UnsupportedOutput'):
+        unsupported_registry.build_dump(source_dict={'day': '2024-01-02'})
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from schema_overseer_local import BuildError, NoMatchingSchemaError, SchemaRegistry
+
+
+@dataclass
+class Output:
+    value: str
+
+
+class InputFormat(BaseModel):
+    value: str
+
+
+schema_registry = SchemaRegistry(Output)
+schema_registry.add_schema(InputFormat)
+
+
+@schema_registry.add_builder
+def builder(data: InputFormat) -> Output:
+    return Output(value=data.value)
+
+
+schema_registry.setup()
+
+NDJSON = b'{"value": "a"}\n\n{"other": 1}\n{"value": "b"}'
+
+
+def assert_results(results: list[tuple[int, Any]]) -> None:
+    assert [index for index, _ in results] == [0, 2, 3]
+    assert results[0][1] == Output(value='a')
+    assert isinstance(results[1][1], NoMatchingSchemaError)
+    assert results[2][1] == Output(value='b')
+
+
+def test_build_iter_path(tmp_path: Path) -> None:
+    """Tests that build_iter reads lines from the file path"""
+
+    path = tmp_path / 'payloads.ndjson'
+    path.write_bytes(NDJSON)
+
+    assert_results(list(schema_registry.build_iter(path)))
+    assert_results(list(schema_registry.build_iter(str(path))))
+
+
+@pytest.mark.parametrize('chunk_size', [None, 1, 5, 1024])
+def test_build_iter_file_object(chunk_size: int | None) -> None:
+    """Tests that build_iter reads lines from the binary file object, including reading by chunks"""
+
+    assert_results(list(schema_registry.build_iter(io.BytesIO(NDJSON), chunk_size=chunk_size)))
+
+
+def test_build_iter_lines() -> None:
+    """Tests that build_iter works with iterable of lines and is lazy"""
+
+    def lines() -> Any:
+        yield '{"value": "a"}'
+        yield ''
+        yield b'{"other": 1}'
+        yield '{"value": "b"}'
+        pytest.fail('must not be consumed')
+
+    results = schema_registry.build_iter(lines())
+
+    assert_results([next(results) for _ in range(3)])
+
+
+def test_build_iter_on_error() -> None:
+    """Tests that failed lines are passed to on_error callback instead of being yielded"""
+
+    dead_letters: list[tuple[int, str | bytes, BuildError]] = []
+    results = list(schema_registry.build_iter(io.BytesIO(NDJSON), on_error=lambda *args: dead_letters.append(args)))
+
+    assert results == [(0, Output(value='a')), (3, Output(value='b'))]
+    assert len(dead_letters) == 1
+    assert dead_letters[0][:2] == (2, b'{"other": 1}\n')
+    assert isinstance(dead_letters[0][2], NoMatchingSchemaError)
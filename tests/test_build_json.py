@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import pytest
+from pydantic import BaseModel
+
+from schema_overseer_local import MultipleValidSchemasError, NoMatchingSchemaError, SchemaRegistry
+
+
+@dataclass
+class Output:
+    value: str
+
+
+schema_registry = SchemaRegistry(Output)
+checked_registry = SchemaRegistry(Output, check_for_single_valid_schema=True)
+
+
+@checked_registry.add_schema
+@schema_registry.add_schema
+class OldInputFormat(BaseModel):
+    value: str
+
+
+@checked_registry.add_schema
+@schema_registry.add_schema
+class NewInputFormat(BaseModel):
+    renamed_value: int
+
+
+@checked_registry.add_builder
+@schema_registry.add_builder
+def old_builder(data: OldInputFormat) -> Output:
+    return Output(value=data.value)
+
+
+@checked_registry.add_builder
+@schema_registry.add_builder
+def new_builder(data: NewInputFormat) -> Output:
+    return Output(value=str(data.renamed_value))
+
+
+schema_registry.setup()
+checked_registry.setup()
+
+
+@pytest.mark.parametrize('data', ['{"value": "123"}', b'{"renamed_value": 123}', b'{"renamed_value": "123"}'])
+def test_build_json(data: str | bytes) -> None:
+    """Tests that build_json method works with str and bytes"""
+
+    output = schema_registry.build_json(data)
+
+    assert output.value == '123'
+
+
+@pytest.mark.parametrize('data', [b'{"other_value": 123}', b'{"value": "123"', b'', b'[]'])
+def test_build_json_no_matching_schema(data: bytes) -> None:
+    """Tests that NoMatchingSchemaError is raised for invalid JSON and JSON without valid schema"""
+
+    with pytest.raises(NoMatchingSchemaError):
+        schema_registry.build_json(data)
+
+
+def test_build_json_check_for_single_valid_schema() -> None:
+    """Tests that MultipleValidSchemasError is raised if JSON is valid for multiple schemas"""
+
+    assert checked_registry.build_json(b'{"value": "123"}').value == '123'
+    with pytest.raises(MultipleValidSchemasError):
+        checked_registry.build_json(b'{"value": "123", "renamed_value": 123}')
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel
+
+from schema_overseer_local import (
+    MultipleValidSchemasError,
+    NoMatchingSchemaError,
+    OutputValidationError,
+    SchemaRegistry,
+)
+
+
+@dataclass
+class Output:
+    value: int
+
+
+schema_registry = SchemaRegistry(Output, validate_output=True)
+checked_registry = SchemaRegistry(Output, validate_output=True, check_for_single_valid_schema=True)
+
+
+@checked_registry.add_schema
+@schema_registry.add_schema
+class OldInputFormat(BaseModel):
+    value: str
+
+
+@checked_registry.add_schema
+@schema_registry.add_schema
+class NewInputFormat(BaseModel):
+    renamed_value: int
+
+
+@checked_registry.add_builder
+@schema_registry.add_builder
+def old_builder(data: OldInputFormat) -> Output:
+    return Output(value=data.value)  # type: ignore[arg-type]
+
+
+@checked_registry.add_builder
+@schema_registry.add_builder
+def new_builder(data: NewInputFormat) -> Output:
+    return Output(value=data.renamed_value)
+
+
+schema_registry.setup()
+checked_registry.setup()
+
+
+def test_build_many_dicts() -> None:
+    """Tests that build_many returns outputs and errors in the order of the inputs"""
+
+    sources: list[dict[str, Any]] = [{'value': '1'}, {'other': 2}, {'renamed_value': 3}, {'value': 'not a number'}]
+    results = schema_registry.build_many(source_dicts=iter(sources))
+
+    assert len(results) == 4
+    assert results[0] == Output(value=1)
+    assert isinstance(results[1], NoMatchingSchemaError)
+    assert results[2] == Output(value=3)
+    assert isinstance(results[3], OutputValidationError)
+
+
+@dataclass
+class SourceObject:
+    renamed_value: int
+
+
+def test_build_many_objects() -> None:
+    """Tests that build_many works with objects as a source"""
+
+    results = schema_registry.build_many(source_objects=[SourceObject(renamed_value=1), object()])
+
+    assert results[0] == Output(value=1)
+    assert isinstance(results[1], NoMatchingSchemaError)
+
+
+def test_build_many_check_for_single_valid_schema() -> None:
+    """Tests that MultipleValidSchemasError is collected for the ambiguous inputs only"""
+
+    results = checked_registry.build_many(source_dicts=[{'value': '1', 'renamed_value': 1}, {'value': '2'}])
+
+    assert isinstance(results[0], MultipleValidSchemasError)
+    assert results[1] == Output(value=2)
+
+
+def test_build_many_empty() -> None:
+    """Tests that build_many works with empty batch and empty registry"""
+
+    assert schema_registry.build_many(source_dicts=[]) == []
+
+    empty_registry = SchemaRegistry(Output)
+    empty_registry.setup()
+    results = empty_registry.build_many(source_dicts=[{'value': '1'}])
+
+    assert len(results) == 1
+    assert isinstance(results[0], NoMatchingSchemaError)
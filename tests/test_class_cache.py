@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import gc
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import pytest
+from pydantic import BaseModel
+
+from schema_overseer_local import MultipleValidSchemasError, SchemaRegistry
+from schema_overseer_local.dispatch import CacheInfo
+
+
+class IntInputFormat(BaseModel):
+    value: int
+
+
+class StrInputFormat(BaseModel):
+    value: str
+
+
+class OtherInputFormat(BaseModel):
+    other: str
+
+
+class CreatedEvent(BaseModel):
+    kind: Literal['created']
+
+
+class DeletedEvent(BaseModel):
+    kind: Literal['deleted']
+
+
+@dataclass
+class EventRow:
+    kind: str
+
+
+@dataclass
+class ValueRow:
+    value: Any
+
+
+@dataclass
+class OtherRow:
+    other: str
+
+
+@dataclass
+class MixedRow:
+    value: Any
+    other: str
+
+
+def int_builder(data: IntInputFormat) -> str:
+    return 'int'
+
+
+def str_builder(data: StrInputFormat) -> str:
+    return 'str'
+
+
+def other_builder(data: OtherInputFormat) -> str:
+    return 'other'
+
+
+def created_builder(data: CreatedEvent) -> str:
+    return 'created'
+
+
+def deleted_builder(data: DeletedEvent) -> str:
+    return 'deleted'
+
+
+def test_class_cache_hits(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that objects of the cached class are validated by its schema without searching the candidates"""
+
+    schema_registry = SchemaRegistry(str, class_cache=True)
+    schema_registry.add_schema(IntInputFormat, priority_group='value')
+    schema_registry.add_schema(StrInputFormat, priority_group='value')
+    schema_registry.add_schema(OtherInputFormat)
+    schema_registry.add_builder(int_builder)
+    schema_registry.add_builder(str_builder)
+    schema_registry.add_builder(other_builder)
+    schema_registry.setup()
+    assert schema_registry.build(source_object=ValueRow('a')) == 'str'
+
+    def candidates(*args: Any) -> Any:
+        raise AssertionError
+
+    monkeypatch.setattr(schema_registry, '_candidates', candidates)
+    assert schema_registry.build(source_object=ValueRow('b')) == 'str'
+    assert schema_registry.class_cache_info == CacheInfo(hits=1, misses=1, maxsize=0, currsize=1)
+
+
+def test_class_cache_disjoint_schemas(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that the cached schema is tried first, if the preceding schemas can't be valid for the same object"""
+
+    schema_registry = SchemaRegistry(str, class_cache=True)
+    schema_registry.add_schema(CreatedEvent)
+    schema_registry.add_schema(DeletedEvent)
+    schema_registry.add_builder(created_builder)
+    schema_registry.add_builder(deleted_builder)
+    schema_registry.setup()
+    assert schema_registry.build(source_object=EventRow('deleted')) == 'deleted'
+
+    def candidates(*args: Any) -> Any:
+        raise AssertionError
+
+    monkeypatch.setattr(schema_registry, '_candidates', candidates)
+    assert schema_registry.build(source_object=EventRow('deleted')) == 'deleted'
+
+
+def test_class_cache_keeps_first_valid_schema() -> None:
+    """Tests that the cached schema doesn't precede other valid schemas outside of its priority group"""
+
+    schema_registry = SchemaRegistry(str, class_cache=True)
+    schema_registry.add_schema(IntInputFormat)
+    schema_registry.add_schema(StrInputFormat)
+    schema_registry.add_schema(OtherInputFormat)
+    schema_registry.add_builder(int_builder)
+    schema_registry.add_builder(str_builder)
+    schema_registry.add_builder(other_builder)
+    schema_registry.setup()
+
+    assert schema_registry.build(source_object=ValueRow('a')) == 'str'
+    assert schema_registry.build(source_object=ValueRow(1)) == 'int'
+    assert schema_registry.class_cache_info == CacheInfo(hits=0, misses=2, maxsize=0, currsize=1)
+
+
+def test_class_cache_priority_group() -> None:
+    """Tests that the cached schema is tried first within its priority group and replaced, if it's not valid"""
+
+    schema_registry = SchemaRegistry(str, class_cache=True)
+    schema_registry.add_schema(IntInputFormat, priority_group='value')
+    schema_registry.add_schema(StrInputFormat, priority_group='value')
+    schema_registry.add_schema(OtherInputFormat)
+    schema_registry.add_builder(int_builder)
+    schema_registry.add_builder(str_builder)
+    schema_registry.add_builder(other_builder)
+    schema_registry.setup()
+
+    assert schema_registry.build(source_object=ValueRow('a')) == 'str'
+    assert schema_registry.build(source_object=ValueRow('b')) == 'str'
+    assert schema_registry.build(source_object=ValueRow(1)) == 'int'
+    assert schema_registry.build(source_object=ValueRow(2)) == 'int'
+    assert schema_registry.class_cache_info == CacheInfo(hits=2, misses=2, maxsize=0, currsize=1)
+
+
+def test_class_cache_check_for_single_valid_schema() -> None:
+    """Tests that other schemas are still checked for the objects of the cached class"""
+
+    schema_registry = SchemaRegistry(str, class_cache=True, check_for_single_valid_schema=True)
+    schema_registry.add_schema(IntInputFormat)
+    schema_registry.add_schema(StrInputFormat)
+    schema_registry.add_schema(OtherInputFormat)
+    schema_registry.add_builder(int_builder)
+    schema_registry.add_builder(str_builder)
+    schema_registry.add_builder(other_builder)
+    schema_registry.setup()
+
+    assert schema_registry.build(source_object=MixedRow(value=[], other='a')) == 'other'
+    with pytest.raises(MultipleValidSchemasError):
+        schema_registry.build(source_object=MixedRow(value='a', other='b'))
+
+
+def test_class_cache_weak_keys() -> None:
+    """Tests that the cache doesn't keep classes alive"""
+
+    schema_registry = SchemaRegistry(str, class_cache=True)
+    schema_registry.add_schema(IntInputFormat)
+    schema_registry.add_schema(StrInputFormat)
+    schema_registry.add_schema(OtherInputFormat)
+    schema_registry.add_builder(int_builder)
+    schema_registry.add_builder(str_builder)
+    schema_registry.add_builder(other_builder)
+    schema_registry.setup()
+    row_class = type('DynamicRow', (), {'other': 'a'})
+    assert schema_registry.build(source_object=row_class()) == 'other'
+    assert schema_registry.class_cache_info.currsize == 1  # type: ignore[union-attr]
+
+    del row_class
+    gc.collect()
+    assert schema_registry.class_cache_info.currsize == 0  # type: ignore[union-attr]
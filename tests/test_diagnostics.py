@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import pickle
+from types import SimpleNamespace
+from typing import Any, Literal
+
+import pytest
+from pydantic import BaseModel
+
+from schema_overseer_local import NoMatchingSchemaError, SchemaFailure, SchemaRegistry, diagnostics
+
+schema_registry = SchemaRegistry(str)
+union_registry = SchemaRegistry(str, engine='union')
+versioned_registry = SchemaRegistry(str)
+
+
+@versioned_registry.add_schema
+@union_registry.add_schema
+@schema_registry.add_schema
+class OldInputFormat(BaseModel):
+    name: str
+    value: int
+    extra: int
+
+
+@union_registry.add_schema
+@schema_registry.add_schema
+class NewInputFormat(BaseModel):
+    name: str
+    value: int
+
+
+@versioned_registry.add_schema
+class VersionedInputFormat(BaseModel):
+    version: Literal['v1', 'v2']
+    value: int
+
+
+@versioned_registry.add_builder
+@union_registry.add_builder
+@schema_registry.add_builder
+def old_builder(data: OldInputFormat) -> str:
+    return 'old'
+
+
+@union_registry.add_builder
+@schema_registry.add_builder
+def new_builder(data: NewInputFormat) -> str:
+    return 'new'
+
+
+@versioned_registry.add_builder
+def versioned_builder(data: VersionedInputFormat) -> str:
+    return 'versioned'
+
+
+schema_registry.setup()
+union_registry.setup()
+versioned_registry.setup()
+
+
+@pytest.mark.parametrize('schema_registry', [schema_registry, union_registry])
+def test_no_matching_schema_failures(schema_registry: SchemaRegistry[str]) -> None:
+    """Tests that validation errors are summarized per schema, the closest schema first"""
+
+    with pytest.raises(NoMatchingSchemaError) as exc_info:
+        schema_registry.build(source_dict={'name': 'a', 'value': 'b', 'extra': 1})
+
+    # the order of the schemas with the same number of errors is kept
+    assert exc_info.value.closest == f'{__name__}.OldInputFormat'
+    assert exc_info.value.failures == (
+        SchemaFailure(
+            f'{__name__}.OldInputFormat',
+            1,
+            ('value: Input should be a valid integer, unable to parse string as an integer',),
+        ),
+        SchemaFailure(
+            f'{__name__}.NewInputFormat',
+            1,
+            ('value: Input should be a valid integer, unable to parse string as an integer',),
+        ),
+    )
+    assert str(exc_info.value).startswith(
+        f'closest schema {__name__}.OldInputFormat has 1 validation error(s): value:'
+    )
+
+
+def test_no_matching_schema_failures_ranking() -> None:
+    """Tests that schemas are ranked by the number of errors"""
+
+    with pytest.raises(NoMatchingSchemaError) as exc_info:
+        schema_registry.build_json('{"name": "a", "value": "b", "extra": "c"}')
+
+    assert [(failure.schema, failure.error_count) for failure in exc_info.value.failures] == [
+        (f'{__name__}.NewInputFormat', 1),
+        (f'{__name__}.OldInputFormat', 2),
+    ]
+
+
+def test_no_matching_schema_failures_caps(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that the number of schemas, errors and the error length are capped"""
+
+    monkeypatch.setattr(diagnostics, 'MAX_SCHEMAS', 1)
+    monkeypatch.setattr(diagnostics, 'MAX_ERRORS', 1)
+    monkeypatch.setattr(diagnostics, 'MAX_ERROR_LENGTH', 10)
+    with pytest.raises(NoMatchingSchemaError) as exc_info:
+        schema_registry.build(source_dict={'name': 1, 'value': 'b', 'extra': 'c'})
+
+    assert exc_info.value.failures == (SchemaFailure(f'{__name__}.NewInputFormat', 2, ('name: Inpu',)),)
+
+
+@pytest.mark.parametrize(
+    'source', [{'name': 'a', 'version': 'v3'}, SimpleNamespace(name='a', version='v3')], ids=['dict', 'object']
+)
+def test_no_matching_schema_excluded_schemas(source: Any) -> None:
+    """Tests that schemas excluded without validation are summarized by missing keys and not accepted literals"""
+
+    if isinstance(source, dict):
+        with pytest.raises(NoMatchingSchemaError) as exc_info:
+            versioned_registry.build(source_dict=source)
+    else:
+        with pytest.raises(NoMatchingSchemaError) as exc_info:
+            versioned_registry.build(source_object=source)
+
+    assert exc_info.value.failures == (
+        SchemaFailure(
+            f'{__name__}.OldInputFormat', 2, ("missing required key(s) 'extra'", "missing required key(s) 'value'")
+        ),
+        SchemaFailure(
+            f'{__name__}.VersionedInputFormat',
+            2,
+            ("missing required key(s) 'value'", "version: Input should be 'v1' or 'v2'"),
+        ),
+    )
+
+
+def test_no_matching_schema_excluded_schemas_cap(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that only the first excluded schemas in the registry order are summarized"""
+
+    monkeypatch.setattr(diagnostics, 'MAX_EXCLUDED_SCHEMAS', 1)
+
+    with pytest.raises(NoMatchingSchemaError) as exc_info:
+        versioned_registry.build(source_dict={'name': 'a', 'version': 'v3'})
+
+    assert [failure.schema for failure in exc_info.value.failures] == [f'{__name__}.OldInputFormat']
+
+
+def test_no_matching_schema_invalid_json() -> None:
+    """Tests that invalid JSON is not attributed to any schema"""
+
+    with pytest.raises(NoMatchingSchemaError) as exc_info:
+        schema_registry.build_json('{')
+
+    assert exc_info.value.failures == ()
+    assert exc_info.value.closest is None
+
+
+def test_no_matching_schema_error_pickle() -> None:
+    """Tests that failures are kept by pickling, e.g. for the errors of worker processes"""
+
+    error = NoMatchingSchemaError([SchemaFailure('InputFormat', 1, ('value: Field required',))])
+
+    assert pickle.loads(pickle.dumps(error)).failures == error.failures  # noqa: S301
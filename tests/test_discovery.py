@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from schema_overseer_local import SchemaRegistry, utils
+from schema_overseer_local.utils import discover
+
+PACKAGE = 'discovery_package'
+
+
+@pytest.fixture()
+def package(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    root = tmp_path / PACKAGE
+    (root / 'sub').mkdir(parents=True)
+    for path in ['__init__.py', 'a.py', 'sub/__init__.py', 'sub/b.py']:
+        (root / path).write_text('')
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    yield root
+    unload()
+
+
+def unload() -> None:
+    for name in list(sys.modules):
+        if name.split('.')[0] == PACKAGE:
+            del sys.modules[name]
+
+
+def test_discover_manifest(package: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that modules are imported by the manifest list without walking the packages"""
+
+    manifest_path = tmp_path / 'manifest.json'
+    modules = [PACKAGE, f'{PACKAGE}.a', f'{PACKAGE}.sub', f'{PACKAGE}.sub.b']
+
+    assert list(discover([PACKAGE], manifest_path)) == modules
+    assert json.loads(manifest_path.read_text())['entries'][PACKAGE]['modules'] == modules
+
+    def iter_modules(*args: Any) -> Any:
+        raise AssertionError
+
+    unload()
+    monkeypatch.setattr(utils, 'iter_modules', iter_modules)
+    assert list(discover([PACKAGE], manifest_path)) == modules
+    assert f'{PACKAGE}.sub.b' in sys.modules
+
+
+def test_discover_manifest_changed_package(package: Path, tmp_path: Path) -> None:
+    """Tests that the package is walked again, if its directory has changed"""
+
+    manifest_path = tmp_path / 'manifest.json'
+    discover([PACKAGE], manifest_path)
+
+    (package / 'sub' / 'c.py').write_text('')
+    mtime = (package / 'sub').stat().st_mtime_ns
+    os.utime(package / 'sub', ns=(mtime + 10**9, mtime + 10**9))
+
+    unload()
+    assert f'{PACKAGE}.sub.c' in discover([PACKAGE], manifest_path)
+    assert f'{PACKAGE}.sub.c' in json.loads(manifest_path.read_text())['entries'][PACKAGE]['modules']
+
+
+@pytest.mark.parametrize(
+    'content',
+    [
+        '{invalid',
+        '{"version": 1}',
+        '{"version": 1, "entries": []}',
+        f'{{"version": 1, "entries": {{"{PACKAGE}": {{"modules": []}}}}}}',
+        f'{{"version": 1, "entries": {{"{PACKAGE}": {{"directories": {{}}}}}}}}',
+    ],
+)
+def test_discover_invalid_manifest(package: Path, tmp_path: Path, content: str) -> None:
+    """Tests that unreadable or malformed manifest is ignored and replaced"""
+
+    manifest_path = tmp_path / 'manifest.json'
+    manifest_path.write_text(content)
+
+    assert f'{PACKAGE}.a' in discover([PACKAGE], manifest_path)
+    assert json.loads(manifest_path.read_text())['version'] == 1
+
+
+def test_registry_import_times(package: Path, tmp_path: Path) -> None:
+    """Tests that the registry reports import durations of the discovered modules"""
+
+    (package / 'a.py').write_text('import time\ntime.sleep(0.05)\n')
+    schema_registry = SchemaRegistry(str, discovery_paths=[PACKAGE], discovery_manifest=tmp_path / 'manifest.json')
+    schema_registry.setup()
+
+    import_times = schema_registry.import_times
+    assert next(iter(import_times)) == f'{PACKAGE}.a'
+    assert import_times[f'{PACKAGE}.a'] >= 0.05
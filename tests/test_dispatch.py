@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import pytest
+from pydantic import BaseModel, Field, model_validator
+
+from schema_overseer_local import NoMatchingSchemaError, SchemaRegistry
+from schema_overseer_local.dispatch import DiscriminatorIndex, dict_getter
+
+
+class InputV1(BaseModel):
+    version: Literal['v1']
+    value: str
+
+
+class InputV2(BaseModel):
+    version: Literal['v2', 'v2.1']
+    value: str
+
+
+class InputLegacy(BaseModel):
+    value: str
+
+
+class InputAliased(BaseModel):
+    kind: Literal[3] = Field(alias='schemaKind')
+
+
+def test_candidates_by_literal_value() -> None:
+    """Tests that only schemas accepting the literal value are kept, in the original order"""
+
+    index = DiscriminatorIndex([InputV1, InputLegacy, InputV2, InputAliased])
+
+    assert index.candidates(dict_getter({'version': 'v2.1', 'schemaKind': 3})) == (InputLegacy, InputV2, InputAliased)
+    assert index.candidates(dict_getter({'version': 'v2.1'})) == (InputLegacy, InputV2)
+    assert index.candidates(dict_getter({'version': 'v3', 'schemaKind': 3})) == (InputLegacy, InputAliased)
+    assert index.candidates(dict_getter({'kind': 3})) == (InputLegacy,)
+
+
+def test_candidates_for_values_of_other_types() -> None:
+    """Tests that schemas are kept if the value type could be coerced by pydantic"""
+
+    index = DiscriminatorIndex([InputV1, InputLegacy])
+
+    assert index.candidates(dict_getter({'version': b'v1'})) == (InputV1, InputLegacy)
+    assert index.candidates(dict_getter({'version': 1})) == (InputV1, InputLegacy)
+
+
+def test_schemas_with_before_validators_are_not_indexed() -> None:
+    """Tests that schemas which could transform the input are always kept as candidates"""
+
+    class InputWithDefaultVersion(BaseModel):
+        version: Literal['v1']
+
+        @model_validator(mode='before')
+        @classmethod
+        def set_version(cls, data: Any) -> Any:
+            return {'version': 'v1', **data}
+
+    index = DiscriminatorIndex([InputV2, InputWithDefaultVersion])
+
+    assert index.candidates(dict_getter({})) == (InputWithDefaultVersion,)
+
+
+schema_registry = SchemaRegistry(str)
+schema_registry.add_schema(InputV1)
+schema_registry.add_schema(InputV2)
+
+
+@schema_registry.add_builder
+def builder_v1(data: InputV1) -> str:
+    return f'v1 {data.value}'
+
+
+@schema_registry.add_builder
+def builder_v2(data: InputV2) -> str:
+    return f'v2 {data.value}'
+
+
+schema_registry.setup()
+
+
+@dataclass
+class SourceObject:
+    version: str
+    value: str
+
+
+@pytest.mark.parametrize(
+    ('source', 'expected'),
+    [
+        ({'version': 'v1', 'value': 'a'}, 'v1 a'),
+        ({'version': 'v2', 'value': 'b'}, 'v2 b'),
+        (SourceObject(version='v2.1', value='c'), 'v2 c'),
+    ],
+)
+def test_build_dispatch(source: Any, expected: str) -> None:
+    """Tests that build uses the schema matching the literal value"""
+
+    if isinstance(source, dict):
+        assert schema_registry.build(source_dict=source) == expected
+    else:
+        assert schema_registry.build(source_object=source) == expected
+
+
+@pytest.mark.parametrize('source', [{'version': 'v3', 'value': 'a'}, {'value': 'a'}])
+def test_build_dispatch_no_matching_schema(source: dict[str, Any]) -> None:
+    """Tests that NoMatchingSchemaError is still raised if all schemas are excluded"""
+
+    with pytest.raises(NoMatchingSchemaError):
+        schema_registry.build(source_dict=source)
+
+
+class InputAliasedKind(BaseModel):
+    kind: Literal['b'] = Field(alias='Kind')
+    value: str
+
+
+def test_build_dispatch_schema_instance_with_aliases() -> None:
+    """Tests that instances of the schemas are not excluded by the aliases of their literal fields"""
+
+    aliased_registry = SchemaRegistry(str)
+    aliased_registry.add_schema(InputAliasedKind)
+
+    @aliased_registry.add_builder
+    def builder(data: InputAliasedKind) -> str:
+        return data.value
+
+    aliased_registry.setup()
+
+    assert aliased_registry.build(source_object=InputAliasedKind(Kind='b', value='a')) == 'a'
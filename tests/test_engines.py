@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import pytest
+from pydantic import BaseModel
+
+from schema_overseer_local import MultipleValidSchemasError, NoMatchingSchemaError, SchemaRegistry
+
+ENGINES = ['loop', 'union']
+
+
+class InputFormat(BaseModel):
+    value: str
+
+
+class ExtendedInputFormat(InputFormat):
+    extra: int
+
+
+class OtherInputFormat(BaseModel):
+    other: int
+
+
+loop_registry = SchemaRegistry(str)
+union_registry = SchemaRegistry(str, engine='union')
+for registry in (loop_registry, union_registry):
+    registry.add_schema(ExtendedInputFormat)
+    registry.add_schema(InputFormat)
+    registry.add_schema(OtherInputFormat)
+
+
+@union_registry.add_builder
+@loop_registry.add_builder
+def extended_builder(data: ExtendedInputFormat) -> str:
+    return f'extended {data.value} {data.extra}'
+
+
+@union_registry.add_builder
+@loop_registry.add_builder
+def builder(data: InputFormat) -> str:
+    return f'plain {data.value}'
+
+
+@union_registry.add_builder
+@loop_registry.add_builder
+def other_builder(data: OtherInputFormat) -> str:
+    return f'other {data.other}'
+
+
+loop_registry.setup()
+union_registry.setup()
+
+
+class ForwardRefInputFormat(BaseModel):
+    child: LaterInputFormat
+
+
+class LaterInputFormat(BaseModel):
+    value: str
+
+
+@dataclass
+class SourceObject:
+    other: int
+
+
+@pytest.mark.parametrize('schema_registry', [loop_registry, union_registry])
+@pytest.mark.parametrize(
+    ('source', 'expected'),
+    [
+        ({'value': 'a', 'extra': 1}, 'extended a 1'),
+        ({'value': 'a'}, 'plain a'),
+        ({'other': '2'}, 'other 2'),
+        (SourceObject(other=3), 'other 3'),
+    ],
+)
+def test_engines_first_valid_schema(schema_registry: SchemaRegistry[str], source: Any, expected: str) -> None:
+    """Tests that all engines select the first valid schema in the registration order"""
+
+    if isinstance(source, dict):
+        assert schema_registry.build(source_dict=source) == expected
+    else:
+        assert schema_registry.build(source_object=source) == expected
+
+
+@pytest.mark.parametrize('schema_registry', [loop_registry, union_registry])
+def test_engines_no_matching_schema(schema_registry: SchemaRegistry[str]) -> None:
+    """Tests that all engines raise NoMatchingSchemaError if no schema is valid"""
+
+    with pytest.raises(NoMatchingSchemaError):
+        schema_registry.build(source_dict={'other': 'not a number'})
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_engines_check_for_single_valid_schema(engine: Literal['loop', 'union']) -> None:
+    """Tests that all engines detect multiple valid schemas"""
+
+    schema_registry = SchemaRegistry(str, engine=engine, check_for_single_valid_schema=True)
+    schema_registry.add_schema(ExtendedInputFormat)
+    schema_registry.add_schema(InputFormat)
+    schema_registry.add_builder(extended_builder)
+    schema_registry.add_builder(builder)
+    schema_registry.setup()
+
+    assert schema_registry.build(source_dict={'value': 'a'}) == 'plain a'
+    with pytest.raises(MultipleValidSchemasError):
+        schema_registry.build(source_dict={'value': 'a', 'extra': 1})
+
+
+def test_union_engine_empty_registry() -> None:
+    """Tests that union engine raises NoMatchingSchemaError if no schemas are registered"""
+
+    schema_registry = SchemaRegistry(str, engine='union')
+    schema_registry.setup()
+
+    with pytest.raises(NoMatchingSchemaError):
+        schema_registry.build(source_dict={'value': 'a'})
+
+
+def test_setup_with_forward_references() -> None:
+    """Tests that the union validator isn't compiled in setup(), so forward references could be resolved later"""
+
+    schema_registry = SchemaRegistry(str)
+    schema_registry.add_schema(ForwardRefInputFormat)
+
+    @schema_registry.add_builder
+    def builder(data: ForwardRefInputFormat) -> str:
+        return data.child.value
+
+    schema_registry.setup()
+    ForwardRefInputFormat.model_rebuild()
+
+    assert schema_registry.build(source_dict={'child': {'value': 'a'}}) == 'a'
+    assert schema_registry.build_json('{"child": {"value": "b"}}') == 'b'
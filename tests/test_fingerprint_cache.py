@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from schema_overseer_local import SchemaRegistry
+from schema_overseer_local.dispatch import CacheInfo, promote
+
+
+class IntInputFormat(BaseModel):
+    value: int
+
+
+class StrInputFormat(BaseModel):
+    value: str
+
+
+class OtherInputFormat(BaseModel):
+    other: str
+
+
+def int_builder(data: IntInputFormat) -> str:
+    return 'int'
+
+
+def str_builder(data: StrInputFormat) -> str:
+    return 'str'
+
+
+def other_builder(data: OtherInputFormat) -> str:
+    return 'other'
+
+
+def test_fingerprint_cache_hits() -> None:
+    """Tests that the schema matched for the same key set is counted as a hit"""
+
+    schema_registry = SchemaRegistry(str, fingerprint_cache_size=10)
+    schema_registry.add_schema(IntInputFormat)
+    schema_registry.add_schema(StrInputFormat)
+    schema_registry.add_schema(OtherInputFormat)
+    schema_registry.add_builder(int_builder)
+    schema_registry.add_builder(str_builder)
+    schema_registry.add_builder(other_builder)
+    schema_registry.setup()
+
+    assert schema_registry.build(source_dict={'other': 'a'}) == 'other'
+    assert schema_registry.build(source_dict={'other': 'b'}) == 'other'
+    assert schema_registry.build(source_dict={'value': 'a'}) == 'str'
+    assert schema_registry.build(source_dict={'value': 1}) == 'int'
+
+    assert schema_registry.fingerprint_cache_info == CacheInfo(hits=1, misses=3, maxsize=10, currsize=2)
+
+
+def test_fingerprint_cache_keeps_first_valid_schema() -> None:
+    """Tests that the cached schema doesn't precede other valid schemas outside of its priority group"""
+
+    schema_registry = SchemaRegistry(str, fingerprint_cache_size=10)
+    schema_registry.add_schema(IntInputFormat)
+    schema_registry.add_schema(StrInputFormat)
+    schema_registry.add_schema(OtherInputFormat)
+    schema_registry.add_builder(int_builder)
+    schema_registry.add_builder(str_builder)
+    schema_registry.add_builder(other_builder)
+    schema_registry.setup()
+
+    assert schema_registry.build(source_dict={'value': 'a'}) == 'str'
+    assert schema_registry.build(source_dict={'value': 1}) == 'int'
+
+
+def test_fingerprint_cache_value_types() -> None:
+    """Tests that value types could be a part of the fingerprint"""
+
+    schema_registry = SchemaRegistry(str, fingerprint_cache_size=10, fingerprint_value_types=True)
+    schema_registry.add_schema(IntInputFormat, priority_group='value')
+    schema_registry.add_schema(StrInputFormat, priority_group='value')
+    schema_registry.add_schema(OtherInputFormat)
+    schema_registry.add_builder(int_builder)
+    schema_registry.add_builder(str_builder)
+    schema_registry.add_builder(other_builder)
+    schema_registry.setup()
+
+    assert schema_registry.build(source_dict={'value': 'a'}) == 'str'
+    assert schema_registry.build(source_dict={'value': 1}) == 'int'
+    assert schema_registry.build(source_dict={'value': 'b'}) == 'str'
+
+    assert schema_registry.fingerprint_cache_info == CacheInfo(hits=1, misses=2, maxsize=10, currsize=2)
+
+
+def test_fingerprint_cache_size_limit() -> None:
+    """Tests that the least recently used fingerprints are evicted"""
+
+    schema_registry = SchemaRegistry(str, fingerprint_cache_size=2)
+    schema_registry.add_schema(IntInputFormat)
+    schema_registry.add_schema(StrInputFormat)
+    schema_registry.add_schema(OtherInputFormat)
+    schema_registry.add_builder(int_builder)
+    schema_registry.add_builder(str_builder)
+    schema_registry.add_builder(other_builder)
+    schema_registry.setup()
+
+    for i in range(10):
+        assert schema_registry.build(source_dict={'other': 'a', f'random_{i}': i}) == 'other'
+
+    info = schema_registry.fingerprint_cache_info
+    assert info is not None
+    assert info.currsize == 2
+
+
+def test_promote() -> None:
+    """Tests that the model is moved forward only over the models of the same group"""
+
+    candidates = (IntInputFormat, StrInputFormat, OtherInputFormat)
+    groups: dict[type[BaseModel], str] = {StrInputFormat: 'a', OtherInputFormat: 'a'}
+
+    assert promote(candidates, OtherInputFormat, None) == (OtherInputFormat, IntInputFormat, StrInputFormat)
+    assert promote(candidates, OtherInputFormat, groups) == (IntInputFormat, OtherInputFormat, StrInputFormat)
+    assert promote(candidates, OtherInputFormat, {}) == candidates
+    assert promote(candidates[:2], OtherInputFormat, None) == candidates[:2]
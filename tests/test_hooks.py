@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, ContextManager, Iterator
+
+import pytest
+from pydantic import BaseModel
+
+from schema_overseer_local import NoMatchingSchemaError, SchemaRegistry
+from schema_overseer_local.hooks import BuildHook, SlowBuildProfiler
+
+
+@dataclass
+class Output:
+    value: str
+
+
+class OldInputFormat(BaseModel):
+    value: str
+
+
+class NewInputFormat(BaseModel):
+    value: int
+
+
+class RecordingHook(BuildHook):
+    def __init__(self) -> None:
+        self.events: list[str] = []
+
+    @contextmanager
+    def _span(self, name: str) -> Iterator[None]:
+        self.events.append(f'{name} start')
+        try:
+            yield
+        except Exception as error:
+            self.events.append(f'{name} {type(error).__name__}')
+            raise
+        self.events.append(f'{name} end')
+
+    def build(self) -> ContextManager[Any]:
+        return self._span('build')
+
+    def attempt(self, model: type[BaseModel] | None) -> ContextManager[Any]:
+        return self._span(f'attempt {None if model is None else model.__name__}')
+
+    def match(self, model: type[BaseModel]) -> None:
+        self.events.append(f'match {model.__name__}')
+
+    def builder(self, model: type[BaseModel]) -> ContextManager[Any]:
+        return self._span(f'builder {model.__name__}')
+
+    def output_validation(self, model: type[BaseModel]) -> ContextManager[Any]:
+        return self._span(f'output_validation {model.__name__}')
+
+
+def old_builder(data: OldInputFormat) -> Output:
+    return Output(value=data.value)
+
+
+def new_builder(data: NewInputFormat) -> Output:
+    return Output(value=str(data.value))
+
+
+def test_hooks_loop_engine() -> None:
+    """Tests that hooks get all the events of the build, including errors of the phases"""
+
+    schema_registry = SchemaRegistry(Output, validate_output=True)
+    schema_registry.add_schema(OldInputFormat)
+    schema_registry.add_schema(NewInputFormat)
+    schema_registry.add_builder(old_builder)
+    schema_registry.add_builder(new_builder)
+    schema_registry.setup()
+    hook = schema_registry.add_hook(RecordingHook())
+
+    schema_registry.build(source_dict={'value': 1})
+
+    assert hook.events == [
+        'build start',
+        'attempt OldInputFormat start',
+        'attempt OldInputFormat ValidationError',
+        'attempt NewInputFormat start',
+        'attempt NewInputFormat end',
+        'match NewInputFormat',
+        'builder NewInputFormat start',
+        'builder NewInputFormat end',
+        'output_validation NewInputFormat start',
+        'output_validation NewInputFormat end',
+        'build end',
+    ]
+
+    hook.events.clear()
+    with pytest.raises(NoMatchingSchemaError):
+        schema_registry.build(source_dict={'value': []})
+    assert hook.events[-1] == 'build NoMatchingSchemaError'
+
+
+def test_hooks_union_engine() -> None:
+    """Tests that a single attempt is reported for the union of all schemas"""
+
+    schema_registry = SchemaRegistry(Output, validate_output=True, engine='union')
+    schema_registry.add_schema(OldInputFormat)
+    schema_registry.add_schema(NewInputFormat)
+    schema_registry.add_builder(old_builder)
+    schema_registry.add_builder(new_builder)
+    schema_registry.setup()
+    first, second = schema_registry.add_hook(RecordingHook()), schema_registry.add_hook(RecordingHook())
+
+    schema_registry.build_json('{"value": "a"}')
+
+    assert first.events[:4] == ['build start', 'attempt None start', 'attempt None end', 'match OldInputFormat']
+    assert first.events == second.events
+
+    schema_registry.remove_hook(first)
+    schema_registry.build(source_dict={'value': 'a'})
+    assert len(second.events) > len(first.events)
+
+
+def test_slow_build_profiler(caplog: pytest.LogCaptureFixture) -> None:
+    """Tests that the profiler keeps the slowest builds and logs them with phase breakdown"""
+
+    schema_registry = SchemaRegistry(Output, validate_output=True)
+    schema_registry.add_schema(OldInputFormat)
+    schema_registry.add_schema(NewInputFormat)
+    schema_registry.add_builder(old_builder)
+    schema_registry.add_builder(new_builder)
+    schema_registry.setup()
+    profiler = SlowBuildProfiler(sample_rate=1, threshold=0, keep=2)
+    schema_registry.add_hook(profiler)
+
+    with caplog.at_level(logging.WARNING, logger='schema_overseer_local.hooks'):
+        sources: list[dict[str, Any]] = [{'value': 'a'}, {'value': 1}, {'value': 2}]
+        for source in sources:
+            schema_registry.build(source_dict=source)
+
+    assert len(caplog.records) == 3
+    assert 'attempt NewInputFormat' in caplog.records[1].getMessage()
+
+    slowest = profiler.slowest
+    assert len(slowest) == 2
+    assert slowest[0].duration >= slowest[1].duration
+    assert [phase for phase, _, _ in slowest[0].phases][-2:] == ['builder', 'output_validation']
+
+
+def test_slow_build_profiler_sampling() -> None:
+    """Tests that builds are not profiled if they are not sampled"""
+
+    schema_registry = SchemaRegistry(Output, validate_output=True)
+    schema_registry.add_schema(OldInputFormat)
+    schema_registry.add_schema(NewInputFormat)
+    schema_registry.add_builder(old_builder)
+    schema_registry.add_builder(new_builder)
+    schema_registry.setup()
+    profiler = SlowBuildProfiler(sample_rate=0)
+    schema_registry.add_hook(profiler)
+
+    schema_registry.build(source_dict={'value': 'a'})
+
+    assert profiler.slowest == []
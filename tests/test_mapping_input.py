@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Any, Iterator, Literal, Mapping
+
+import pytest
+from pydantic import BaseModel, ConfigDict
+
+from schema_overseer_local import SchemaRegistry
+
+schema_registry = SchemaRegistry(str)
+union_registry = SchemaRegistry(str, engine='union')
+
+
+@union_registry.add_schema
+@schema_registry.add_schema
+class InputFormat(BaseModel):
+    value: str
+
+
+@union_registry.add_schema
+@schema_registry.add_schema
+class StrictInputFormat(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    number: int
+
+
+class CustomInitInputFormat(BaseModel):
+    name: str
+
+    def __init__(self, **data: Any) -> None:
+        super().__init__(**{**data, 'name': data['name'].upper()})
+
+
+def custom_init_builder(data: CustomInitInputFormat) -> str:
+    return data.name
+
+
+class LazyMapping(Mapping[str, Any]):
+    """Mapping decoding values on access, like the ones backed by message buffers"""
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self._data = data
+        self.accessed: list[str] = []
+
+    def __getitem__(self, key: str) -> Any:
+        self.accessed.append(key)
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+@union_registry.add_builder
+@schema_registry.add_builder
+def builder(data: InputFormat) -> str:
+    return data.value
+
+
+@union_registry.add_builder
+@schema_registry.add_builder
+def strict_builder(data: StrictInputFormat) -> str:
+    return str(data.number)
+
+
+schema_registry.setup()
+union_registry.setup()
+
+
+@pytest.mark.parametrize('schema_registry', [schema_registry, union_registry])
+def test_build_from_mapping(schema_registry: SchemaRegistry[str]) -> None:
+    """Tests that any mapping is accepted as `source_dict`, including strict schemas"""
+
+    assert schema_registry.build(source_dict=MappingProxyType({'value': 'a'})) == 'a'
+    assert schema_registry.build(source_dict=MappingProxyType({'number': 1})) == '1'
+    assert schema_registry.build_many(source_dicts=[MappingProxyType({'number': 1}), {'value': 'a'}]) == ['1', 'a']
+
+
+def test_build_from_lazy_mapping() -> None:
+    """Tests that only the keys of the schemas are read from the mapping"""
+
+    schema_registry = SchemaRegistry(str)
+    schema_registry.add_schema(InputFormat)
+    schema_registry.add_builder(builder)
+    schema_registry.setup()
+    source = LazyMapping({'value': 'a', 'payload': 'b' * 1000})
+
+    assert schema_registry.build(source_dict=source) == 'a'
+    assert 'payload' not in source.accessed
+
+
+@pytest.mark.parametrize('engine', ['loop', 'union'])
+def test_build_from_mapping_custom_init(engine: Literal['loop', 'union']) -> None:
+    """Tests that a custom `__init__` of the schema is called for any mapping, as for dicts"""
+
+    custom_init_registry = SchemaRegistry(str, engine=engine)
+    custom_init_registry.add_schema(CustomInitInputFormat)
+    custom_init_registry.add_builder(custom_init_builder)
+    custom_init_registry.setup()
+
+    assert custom_init_registry.build(source_dict={'name': 'a'}) == 'A'
+    assert custom_init_registry.build(source_dict=MappingProxyType({'name': 'a'})) == 'A'
+    assert custom_init_registry.build_many(source_dicts=[MappingProxyType({'name': 'b'})]) == ['B']
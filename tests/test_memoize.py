@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, List
+
+import pytest
+from pydantic import BaseModel
+
+from schema_overseer_local import SchemaRegistry, SetupError
+
+
+@dataclass
+class Output:
+    value: str
+    items: List[str] = field(default_factory=list)  # noqa: UP006
+
+
+class MemoizedInput(BaseModel):
+    value: str
+    items: List[str] = []  # noqa: UP006
+
+
+class OtherInput(BaseModel):
+    other: str
+
+
+class AsyncInput(BaseModel):
+    async_value: str
+
+
+calls: list[str] = []
+
+
+def memoized_builder(data: MemoizedInput) -> Output:
+    calls.append(data.value)
+    return Output(value=data.value, items=list(data.items))
+
+
+def other_builder(data: OtherInput) -> Output:
+    calls.append(data.other)
+    return Output(value=data.other)
+
+
+async def async_builder(data: AsyncInput) -> Output:
+    calls.append(data.async_value)
+    return Output(value=data.async_value)
+
+
+@pytest.fixture(autouse=True)
+def _clear_calls() -> None:
+    calls.clear()
+
+
+def test_memoize_builder() -> None:
+    """Tests that the memoized builder runs once for equal inputs, other builders run every time"""
+
+    schema_registry = SchemaRegistry(Output)
+    schema_registry.add_schema(MemoizedInput)
+    schema_registry.add_schema(OtherInput)
+    schema_registry.add_schema(AsyncInput)
+    schema_registry.add_builder(memoized_builder, memoize=True)
+    schema_registry.add_builder(other_builder)
+    schema_registry.add_builder(async_builder)
+    schema_registry.setup()
+
+    for _ in range(3):
+        assert schema_registry.build(source_dict={'value': 'a', 'items': ['x']}) == Output('a', ['x'])
+        assert schema_registry.build(source_dict={'other': 'b'}) == Output('b')
+    assert schema_registry.build(source_dict={'value': 'a', 'items': ['y']}) == Output('a', ['y'])
+
+    assert calls == ['a', 'b', 'b', 'b', 'a']
+    (info,) = schema_registry.builder_cache_info.values()
+    assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+    assert info.hit_rate == 0.5
+
+    schema_registry.clear_builder_caches()
+    schema_registry.build(source_dict={'value': 'a', 'items': ['x']})
+    assert calls[-1] == 'a'
+
+
+def test_memoize_registry_level() -> None:
+    """Tests that the registry option enables memoization for all builders, including async ones"""
+
+    schema_registry = SchemaRegistry(Output, memoize=True)
+    schema_registry.add_schema(MemoizedInput)
+    schema_registry.add_schema(OtherInput)
+    schema_registry.add_schema(AsyncInput)
+    schema_registry.add_builder(memoized_builder)
+    schema_registry.add_builder(other_builder)
+    schema_registry.add_builder(async_builder)
+    schema_registry.setup()
+
+    for _ in range(2):
+        schema_registry.build(source_dict={'other': 'b'})
+        asyncio.run(schema_registry.abuild(source_dict={'async_value': 'c'}))
+
+    assert calls == ['b', 'c']
+    assert set(schema_registry.builder_cache_info) == {MemoizedInput, OtherInput, AsyncInput}
+
+
+def test_memoize_size_and_ttl() -> None:
+    """Tests that the least recently used and expired outputs are evicted"""
+
+    schema_registry = SchemaRegistry(Output, memoize_size=2, memoize_ttl=0.05)
+    schema_registry.add_schema(MemoizedInput)
+    schema_registry.add_schema(OtherInput)
+    schema_registry.add_schema(AsyncInput)
+    schema_registry.add_builder(memoized_builder, memoize=True)
+    schema_registry.add_builder(other_builder)
+    schema_registry.add_builder(async_builder)
+    schema_registry.setup()
+
+    for value in ['a', 'b', 'c', 'a']:
+        schema_registry.build(source_dict={'value': value})
+    assert calls == ['a', 'b', 'c', 'a']
+
+    schema_registry.build(source_dict={'value': 'c'})
+    assert calls == ['a', 'b', 'c', 'a']
+
+    time.sleep(0.1)
+    schema_registry.build(source_dict={'value': 'c'})
+    assert calls == ['a', 'b', 'c', 'a', 'c']
+
+
+@pytest.mark.parametrize(('memoize_copy', 'expected'), [(False, ['x', 'modified']), (True, ['x'])])
+def test_memoize_copy(memoize_copy: bool, expected: list[str]) -> None:  # noqa: FBT001
+    """Tests that cached output could be protected from modifications by the caller"""
+
+    schema_registry = SchemaRegistry(Output, memoize_copy=memoize_copy)
+    schema_registry.add_schema(MemoizedInput)
+    schema_registry.add_schema(OtherInput)
+    schema_registry.add_schema(AsyncInput)
+    schema_registry.add_builder(memoized_builder, memoize=True)
+    schema_registry.add_builder(other_builder)
+    schema_registry.add_builder(async_builder)
+    schema_registry.setup()
+
+    schema_registry.build(source_dict={'value': 'a', 'items': ['x']}).items.append('modified')
+
+    assert schema_registry.build(source_dict={'value': 'a', 'items': ['x']}).items == expected
+
+
+def test_memoize_invalid_size() -> None:
+    """Tests that cache size is checked during setup"""
+
+    schema_registry = SchemaRegistry(Output, memoize_size=0)
+    schema_registry.add_schema(MemoizedInput)
+    schema_registry.add_builder(memoized_builder, memoize=True)
+
+    with pytest.raises(SetupError, match='memoize_size'):
+        schema_registry.setup()
+
+
+class AnyInput(BaseModel):
+    any_value: Any
+
+
+def any_type_builder(data: AnyInput) -> str:
+    return type(data.any_value).__name__
+
+
+def test_memoize_values_of_different_types() -> None:
+    """Tests that equally serialized inputs of different types are cached separately"""
+
+    schema_registry = SchemaRegistry(str, memoize=True)
+    schema_registry.add_schema(AnyInput)
+    schema_registry.add_builder(any_type_builder)
+    schema_registry.setup()
+
+    for _ in range(2):
+        assert schema_registry.build(source_dict={'any_value': 'a'}) == 'str'
+        assert schema_registry.build(source_dict={'any_value': b'a'}) == 'bytes'
+        assert schema_registry.build(source_dict={'any_value': ['a']}) == 'list'
+        assert schema_registry.build(source_dict={'any_value': ('a',)}) == 'tuple'
+        assert schema_registry.build(source_dict={'any_value': {'a': 1}}) == 'dict'
+        assert schema_registry.build(source_dict={'any_value': {'a': True}}) == 'dict'
+
+    (info,) = schema_registry.builder_cache_info.values()
+    assert (info.hits, info.misses) == (6, 6)
+
+
+def repr_builder(data: AnyInput) -> str:
+    return repr(data.any_value)
+
+
+@pytest.mark.parametrize(
+    'values',
+    [
+        (Decimal('1.0'), Decimal('1.00')),
+        (0.0, -0.0),
+        (datetime(2024, 1, 1, 12, tzinfo=timezone.utc), datetime(2024, 1, 1, 13, tzinfo=timezone(timedelta(hours=1)))),
+        (
+            datetime(2024, 1, 1, 12, tzinfo=timezone.utc).timetz(),
+            datetime(2024, 1, 1, 13, tzinfo=timezone(timedelta(hours=1))).timetz(),
+        ),
+    ],
+)
+def test_memoize_equal_values_with_different_reprs(values: tuple[Any, Any]) -> None:
+    """Tests that inputs, which are equal but differ, are cached separately"""
+
+    schema_registry = SchemaRegistry(str, memoize=True)
+    schema_registry.add_schema(AnyInput)
+    schema_registry.add_builder(repr_builder)
+    schema_registry.setup()
+
+    for value in values:
+        assert schema_registry.build(source_dict={'any_value': value}) == repr(value)
+
+
+def test_memoize_unhashable_values() -> None:
+    """Tests that inputs with unhashable values of unknown types are not cached"""
+
+    class Unhashable:
+        __hash__ = None  # type: ignore[assignment]
+
+    schema_registry = SchemaRegistry(str, memoize=True)
+    schema_registry.add_schema(AnyInput)
+    schema_registry.add_builder(any_type_builder)
+    schema_registry.setup()
+
+    for _ in range(2):
+        assert schema_registry.build(source_dict={'any_value': Unhashable()}) == 'Unhashable'
+
+    (info,) = schema_registry.builder_cache_info.values()
+    assert (info.hits, info.misses) == (0, 0)
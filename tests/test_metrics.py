@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+
+import pytest
+from pydantic import BaseModel
+
+from schema_overseer_local import MultipleValidSchemasError, NoMatchingSchemaError, SchemaRegistry
+
+
+@dataclass
+class Output:
+    value: str
+
+
+class OldInputFormat(BaseModel):
+    value: str
+
+
+class NewInputFormat(BaseModel):
+    renamed_value: str
+    value: int = 0
+
+
+def old_builder(data: OldInputFormat) -> Output:
+    return Output(value=data.value)
+
+
+def new_builder(data: NewInputFormat) -> Output:
+    return Output(value=data.renamed_value)
+
+
+@pytest.mark.parametrize('engine', ['loop', 'union'])
+def test_metrics_snapshot(engine: Literal['loop', 'union']) -> None:
+    """Tests that attempts, matches, failures, phase durations and errors are counted by both engines"""
+
+    schema_registry = SchemaRegistry(Output, collect_metrics=True, validate_output=True, engine=engine)
+    schema_registry.add_schema(OldInputFormat)
+    schema_registry.add_schema(NewInputFormat)
+    schema_registry.add_builder(old_builder)
+    schema_registry.add_builder(new_builder)
+    schema_registry.setup()
+
+    schema_registry.build(source_dict={'value': 'a'})
+    schema_registry.build(source_dict={'value': 1, 'renamed_value': 'b'})
+    with pytest.raises(NoMatchingSchemaError):
+        schema_registry.build(source_dict={'value': [], 'renamed_value': []})
+
+    assert schema_registry.metrics is not None
+    snapshot = schema_registry.metrics.snapshot()
+    old, new = snapshot['schemas'][f'{__name__}.OldInputFormat'], snapshot['schemas'][f'{__name__}.NewInputFormat']
+
+    assert (old['attempts'], old['matches'], old['failures']) == (3, 1, 2)
+    assert (new['matches'], new['failures']) == (1, 1)
+    for phase in ('builder', 'output_validation'):
+        assert old[phase]['count'] == new[phase]['count'] == 1
+        assert old[phase]['buckets']['+Inf'] == 1
+    # the loop engine measures failed attempts too, the union engine attributes the whole call to the matched schema
+    assert old['validation']['count'] == (3 if engine == 'loop' else 1)
+    assert snapshot['errors'] == {'NoMatchingSchemaError': 1}
+
+
+def test_metrics_batch_errors() -> None:
+    """Tests that errors of batches are counted"""
+
+    schema_registry = SchemaRegistry(
+        Output, collect_metrics=True, validate_output=True, check_for_single_valid_schema=True
+    )
+    schema_registry.add_schema(OldInputFormat)
+    schema_registry.add_schema(NewInputFormat)
+    schema_registry.add_builder(old_builder)
+    schema_registry.add_builder(new_builder)
+    schema_registry.setup()
+
+    results = schema_registry.build_many(source_dicts=[{}, {'value': '1', 'renamed_value': 'b'}, {'value': 'a'}])
+
+    assert isinstance(results[1], MultipleValidSchemasError)
+    assert schema_registry.metrics is not None
+    snapshot = schema_registry.metrics.snapshot()
+    assert snapshot['errors'] == {'NoMatchingSchemaError': 1, 'MultipleValidSchemasError': 1}
+    assert snapshot['schemas'][f'{__name__}.OldInputFormat']['matches'] == 2
+
+
+def test_metrics_prometheus() -> None:
+    """Tests Prometheus text exposition format"""
+
+    schema_registry = SchemaRegistry(Output, collect_metrics=True, validate_output=True)
+    schema_registry.add_schema(OldInputFormat)
+    schema_registry.add_schema(NewInputFormat)
+    schema_registry.add_builder(old_builder)
+    schema_registry.add_builder(new_builder)
+    schema_registry.setup()
+    schema_registry.build(source_dict={'value': 1, 'renamed_value': 'b'})
+
+    assert schema_registry.metrics is not None
+    text = schema_registry.metrics.prometheus()
+
+    assert '# TYPE schema_overseer_attempts_total counter\n' in text
+    assert f'schema_overseer_attempts_total{{schema="{__name__}.OldInputFormat"}} 1\n' in text
+    assert f'schema_overseer_matches_total{{schema="{__name__}.NewInputFormat"}} 1\n' in text
+    assert (
+        f'schema_overseer_phase_duration_seconds_bucket{{schema="{__name__}.NewInputFormat",phase="builder",le="+Inf"}} 1\n'
+        in text
+    )
+    assert (
+        f'schema_overseer_phase_duration_seconds_count{{schema="{__name__}.OldInputFormat",phase="builder"}} 0\n'
+        in text
+    )
+
+    schema_registry.metrics.reset()
+    assert (
+        f'schema_overseer_matches_total{{schema="{__name__}.NewInputFormat"}} 0\n'
+        in schema_registry.metrics.prometheus()
+    )
+
+
+class Version1:
+    class Event(BaseModel):
+        name: str
+
+
+class Version2:
+    class Event(BaseModel):
+        title: str
+
+
+def v1_builder(data: Version1.Event) -> Output:
+    return Output(value=data.name)
+
+
+def v2_builder(data: Version2.Event) -> Output:
+    return Output(value=data.title)
+
+
+def test_metrics_schemas_of_the_same_name() -> None:
+    """Tests that schemas of the same name are labeled by their qualified names"""
+
+    schema_registry = SchemaRegistry(Output, collect_metrics=True)
+    schema_registry.add_schema(Version1.Event)
+    schema_registry.add_schema(Version2.Event)
+    schema_registry.add_builder(v1_builder)
+    schema_registry.add_builder(v2_builder)
+    schema_registry.setup()
+    schema_registry.build(source_dict={'name': 'a'})
+    schema_registry.build(source_dict={'title': 'b'})
+    schema_registry.build(source_dict={'title': 'c'})
+
+    assert schema_registry.metrics is not None
+    snapshot = schema_registry.metrics.snapshot()
+    assert snapshot['schemas'][f'{__name__}.Version1.Event']['matches'] == 1
+    assert snapshot['schemas'][f'{__name__}.Version2.Event']['matches'] == 2
+
+
+def test_metrics_disabled() -> None:
+    """Tests that metrics are not collected by default"""
+
+    schema_registry = SchemaRegistry(Output)
+    schema_registry.setup()
+
+    assert schema_registry.metrics is None
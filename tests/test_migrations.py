@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import pytest
+from pydantic import BaseModel
+
+from schema_overseer_local import SchemaRegistry, SetupError
+from schema_overseer_local.migrations import migration_chains
+
+
+@dataclass
+class Output:
+    name: str
+
+
+schema_registry = SchemaRegistry(Output)
+async_registry = SchemaRegistry(Output)
+
+
+@schema_registry.add_schema
+class InputV1(BaseModel):
+    first_name: str
+
+
+@async_registry.add_schema
+@schema_registry.add_schema
+class InputV2(BaseModel):
+    name: str
+
+
+@async_registry.add_schema
+@schema_registry.add_schema
+class InputV3(BaseModel):
+    full_name: str
+
+
+class UnreachableInput(BaseModel):
+    value: str
+
+
+@schema_registry.add_migration
+def v1_to_v2(data: InputV1) -> InputV2:
+    return InputV2(name=data.first_name)
+
+
+@async_registry.add_migration
+@schema_registry.add_migration
+def v2_to_v3(data: InputV2) -> InputV3:
+    return InputV3(full_name=data.name.title())
+
+
+@schema_registry.add_builder
+def v3_builder(data: InputV3) -> Output:
+    return Output(name=data.full_name)
+
+
+@async_registry.add_builder
+async def async_v3_builder(data: InputV3) -> Output:
+    return Output(name=data.full_name)
+
+
+schema_registry.setup()
+async_registry.setup()
+
+
+def test_migrations() -> None:
+    """Tests that schemas without builders are migrated along the chain to the schema with builder"""
+
+    assert schema_registry.build(source_dict={'first_name': 'ann'}) == Output(name='Ann')
+    assert schema_registry.build(source_dict={'name': 'bob'}) == Output(name='Bob')
+    assert schema_registry.build(source_dict={'full_name': 'Eve'}) == Output(name='Eve')
+    chains: dict[type[BaseModel], tuple[type[BaseModel], ...]] = {
+        InputV1: (InputV1, InputV2, InputV3),
+        InputV2: (InputV2, InputV3),
+    }
+    assert schema_registry.migration_chains == chains
+
+
+def test_migration_chains_shortest() -> None:
+    """Tests that the shortest chain is selected, and schemas with builders are not migrated"""
+
+    def migration(data: BaseModel) -> BaseModel:
+        return data
+
+    migrations: dict[type[BaseModel], dict[type[BaseModel], Callable[[Any], BaseModel]]] = {
+        InputV1: {InputV2: migration, InputV3: migration},
+        InputV2: {InputV3: migration},
+        InputV3: {InputV1: migration},
+    }
+
+    chains: dict[type[BaseModel], tuple[type[BaseModel], ...]] = {
+        InputV1: (InputV1, InputV3),
+        InputV2: (InputV2, InputV3),
+    }
+    assert migration_chains(migrations, [InputV3]) == chains
+
+
+def test_migrations_missing_builder() -> None:
+    """Tests that SetupError is raised for schemas without builders and migrations to them"""
+
+    unset_registry = SchemaRegistry(Output)
+    unset_registry.add_schema(InputV1)
+    unset_registry.add_schema(InputV2)
+    unset_registry.add_schema(InputV3)
+    unset_registry.add_migration(v1_to_v2)
+    unset_registry.add_migration(v2_to_v3)
+    unset_registry.add_builder(v3_builder)
+    unset_registry.add_schema(UnreachableInput)
+
+    with pytest.raises(SetupError, match='UnreachableInput'):
+        unset_registry.setup()
+
+
+def test_bad_migrations() -> None:
+    """Tests that migrations must be sync functions between registered schemas"""
+
+    unset_registry = SchemaRegistry(Output)
+    unset_registry.add_schema(InputV1)
+    unset_registry.add_schema(InputV2)
+    unset_registry.add_schema(InputV3)
+    unset_registry.add_migration(v1_to_v2)
+    unset_registry.add_migration(v2_to_v3)
+    unset_registry.add_builder(v3_builder)
+
+    def unregistered(data: UnreachableInput) -> InputV2:
+        return InputV2(name=data.value)
+
+    async def async_migration(data: InputV1) -> InputV2:
+        return InputV2(name=data.first_name)
+
+    def same_schema(data: InputV2) -> InputV2:
+        return data
+
+    with pytest.raises(SetupError, match='registered schemas'):
+        unset_registry.add_migration(unregistered)
+    with pytest.raises(SetupError, match='sync function'):
+        unset_registry.add_migration(async_migration)  # type: ignore[type-var]
+    with pytest.raises(SetupError, match='different schema'):
+        unset_registry.add_migration(same_schema)
+
+
+def test_migrations_async_builder() -> None:
+    """Tests that migrations are composed with async builders for abuild()"""
+
+    assert asyncio.run(async_registry.abuild(source_dict={'name': 'Bob'})) == Output(name='Bob')
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import pytest
+from pydantic import BaseModel, ConfigDict
+
+from schema_overseer_local import MultipleValidSchemasError, SchemaRegistry
+from schema_overseer_local.dispatch import OverlapMatrix
+from schema_overseer_local.utils import schema_name
+
+schema_registry = SchemaRegistry(str, check_for_single_valid_schema=True)
+union_registry = SchemaRegistry(str, check_for_single_valid_schema=True, engine='union')
+
+
+@union_registry.add_schema
+@schema_registry.add_schema
+class CreatedEvent(BaseModel):
+    kind: Literal['created']
+    id: int
+
+
+@union_registry.add_schema
+@schema_registry.add_schema
+class DeletedEvent(BaseModel):
+    kind: Literal['deleted', 'removed']
+    id: int
+
+
+@union_registry.add_schema
+@schema_registry.add_schema
+class StrictIdInput(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+
+    id: int
+
+
+@union_registry.add_schema
+@schema_registry.add_schema
+class NameInput(BaseModel):
+    name: str
+
+
+@union_registry.add_schema
+@schema_registry.add_schema
+class IdInput(BaseModel):
+    id: int
+
+
+@union_registry.add_builder
+@schema_registry.add_builder
+def created_builder(data: CreatedEvent) -> str:
+    return 'CreatedEvent'
+
+
+@union_registry.add_builder
+@schema_registry.add_builder
+def deleted_builder(data: DeletedEvent) -> str:
+    return 'DeletedEvent'
+
+
+@union_registry.add_builder
+@schema_registry.add_builder
+def strict_id_builder(data: StrictIdInput) -> str:
+    return 'StrictIdInput'
+
+
+@union_registry.add_builder
+@schema_registry.add_builder
+def name_builder(data: NameInput) -> str:
+    return 'NameInput'
+
+
+@union_registry.add_builder
+@schema_registry.add_builder
+def id_builder(data: IdInput) -> str:
+    return 'IdInput'
+
+
+schema_registry.setup()
+union_registry.setup()
+
+
+@dataclass
+class Source:
+    id: int
+    name: str
+
+
+MODELS: tuple[type[BaseModel], ...] = (CreatedEvent, DeletedEvent, StrictIdInput, NameInput, IdInput)
+
+
+def test_overlap_matrix() -> None:
+    """Tests that schemas with different literals or unaccepted required keys don't overlap"""
+
+    matrix = OverlapMatrix(MODELS)
+
+    overlapping: dict[type[BaseModel], list[type[BaseModel]]] = {
+        CreatedEvent: [NameInput, IdInput],
+        DeletedEvent: [NameInput, IdInput],
+        StrictIdInput: [IdInput],
+        NameInput: [CreatedEvent, DeletedEvent, IdInput],
+        IdInput: [CreatedEvent, DeletedEvent, StrictIdInput, NameInput],
+    }
+    assert matrix.to_dict() == {
+        schema_name(model): [schema_name(other) for other in others] for model, others in overlapping.items()
+    }
+    assert matrix.overlapping(StrictIdInput, mapping=False) == {CreatedEvent, DeletedEvent, NameInput, IdInput}
+
+
+@pytest.mark.parametrize('schema_registry', [schema_registry, union_registry])
+def test_check_skips_disjoint_schemas(schema_registry: SchemaRegistry[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that only the schemas, which could overlap with the matched one, are validated by the check"""
+
+    validated: list[str] = []
+    validate = SchemaRegistry._validate
+
+    def recording_validate(model: type[BaseModel], *args: Any) -> BaseModel:
+        validated.append(model.__name__)
+        return validate(model, *args)
+
+    monkeypatch.setattr(SchemaRegistry, '_validate', staticmethod(recording_validate))
+
+    with pytest.raises(MultipleValidSchemasError):
+        schema_registry.build(source_dict={'kind': 'created', 'id': 1})
+    assert validated[-1] == 'IdInput'
+    assert 'DeletedEvent' not in validated
+    assert 'StrictIdInput' not in validated
+
+
+def test_check_objects_ignore_extra_forbid() -> None:
+    """Tests that schemas forbidding extra keys still overlap for objects, which are validated by attributes"""
+
+    with pytest.raises(MultipleValidSchemasError):
+        schema_registry.build(source_object=Source(id=1, name='a'))
+    with pytest.raises(MultipleValidSchemasError):
+        schema_registry.build(source_dict={'id': 1, 'name': 'a'})  # NameInput and IdInput
+
+
+def test_overlap_matrix_property() -> None:
+    """Tests that the overlap matrix of the registry is published for review"""
+
+    assert schema_registry.overlap_matrix[f'{__name__}.StrictIdInput'] == [f'{__name__}.IdInput']
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from schema_overseer_local import NoMatchingSchemaError, SchemaRegistry, SetupError
+
+
+@dataclass
+class Output:
+    value: int
+
+
+class InputFormat(BaseModel):
+    value: int
+
+
+schema_registry = SchemaRegistry(Output, import_path='tests.test_parallel:schema_registry')
+schema_registry.add_schema(InputFormat)
+
+
+@schema_registry.add_builder
+def builder(data: InputFormat) -> Output:
+    return Output(value=data.value)
+
+
+schema_registry.setup()
+
+
+def test_build_many_process_pool() -> None:
+    """Tests that build_many returns results in the order of inputs, built in worker processes"""
+
+    sources: list[dict[str, Any]] = [{'value': i} if i % 3 else {'value': 'invalid'} for i in range(50)]
+
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn')) as executor:
+        results = schema_registry.build_many(source_dicts=sources, executor=executor, chunk_size=7)
+
+    assert len(results) == 50
+    for i, result in enumerate(results):
+        if i % 3:
+            assert result == Output(value=i)
+        else:
+            assert isinstance(result, NoMatchingSchemaError)
+
+
+def test_build_many_thread_pool_objects() -> None:
+    """Tests that build_many works with any executor and objects as a source"""
+
+    sources = [Output(value=i) for i in range(10)]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = schema_registry.build_many(source_objects=sources, executor=executor, chunk_size=3)
+
+    assert results == sources
+
+
+def test_build_many_executor_without_import_path() -> None:
+    """Tests that SetupError is raised if the registry can't be imported in the workers"""
+
+    local_registry = SchemaRegistry(Output)
+    local_registry.setup()
+
+    with ThreadPoolExecutor() as executor, pytest.raises(SetupError, match='import_path'):
+        local_registry.build_many(source_dicts=[{'value': 1}], executor=executor)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+import pytest
+from pydantic import AliasChoices, AliasPath, BaseModel, ConfigDict, Field, RootModel, model_validator
+
+from schema_overseer_local import SchemaRegistry
+from schema_overseer_local.dispatch import RequiredKeysFilter, required_keys
+
+
+class PlainInput(BaseModel):
+    value: str
+    optional: Optional[str] = None  # noqa: UP007
+
+
+class AliasedInput(BaseModel):
+    value: str = Field(alias='Value')
+
+
+class PopulatedByNameInput(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    value: str = Field(alias='Value')
+
+
+class AliasChoicesInput(BaseModel):
+    value: str = Field(validation_alias=AliasChoices('first', AliasPath('second', 0)))
+
+
+class RootInput(RootModel[str]):
+    pass
+
+
+class InputWithDefaults(BaseModel):
+    value: str
+
+    @model_validator(mode='before')
+    @classmethod
+    def set_default(cls, data: Any) -> Any:
+        return {'value': 'default', **data}
+
+
+def test_required_keys() -> None:
+    """Tests that aliases and populate_by_name are taken into account"""
+
+    assert required_keys(PlainInput) == (frozenset({'value'}),)
+    assert required_keys(AliasedInput) == (frozenset({'Value'}),)
+    assert required_keys(PopulatedByNameInput) == (frozenset({'Value', 'value'}),)
+    assert required_keys(AliasChoicesInput) == (frozenset({'first', 'second'}),)
+    assert required_keys(RootInput) is None
+    assert required_keys(InputWithDefaults) is None
+
+
+@pytest.mark.parametrize(
+    ('keys', 'expected'),
+    [
+        ({'value'}, [PlainInput, PopulatedByNameInput, RootInput, InputWithDefaults]),
+        ({'Value'}, [AliasedInput, PopulatedByNameInput, RootInput, InputWithDefaults]),
+        ({'second', 'optional'}, [AliasChoicesInput, RootInput, InputWithDefaults]),
+        (set(), [RootInput, InputWithDefaults]),
+    ],
+)
+def test_required_keys_filter(keys: set[str], expected: list[type[BaseModel]]) -> None:
+    """Tests that only candidates with all required keys are kept"""
+
+    models: Sequence[type[BaseModel]] = [
+        PlainInput,
+        AliasedInput,
+        PopulatedByNameInput,
+        AliasChoicesInput,
+        RootInput,
+        InputWithDefaults,
+    ]
+
+    assert list(RequiredKeysFilter(models).filter(models, keys)) == expected
+
+
+@dataclass
+class SourceObject:
+    Value: str
+
+
+def test_build_with_required_keys_filter() -> None:
+    """Tests that build results are the same with the filter for dicts and objects"""
+
+    schema_registry = SchemaRegistry(str)
+    schema_registry.add_schema(PlainInput)
+    schema_registry.add_schema(AliasedInput)
+    schema_registry.add_schema(InputWithDefaults)
+
+    @schema_registry.add_builder
+    def plain_builder(data: PlainInput) -> str:
+        return 'plain'
+
+    @schema_registry.add_builder
+    def aliased_builder(data: AliasedInput) -> str:
+        return 'aliased'
+
+    @schema_registry.add_builder
+    def builder_with_defaults(data: InputWithDefaults) -> str:
+        return 'defaults'
+
+    schema_registry.setup()
+
+    assert schema_registry.build(source_dict={'value': 'a'}) == 'plain'
+    assert schema_registry.build(source_dict={'Value': 'a'}) == 'aliased'
+    assert schema_registry.build(source_object=SourceObject(Value='a')) == 'aliased'
+    assert schema_registry.build(source_dict={}) == 'defaults'
+
+
+class RaisingAttributes:
+    first = 'a'
+
+    @property
+    def Value(self) -> str:  # noqa: N802
+        raise ValueError
+
+
+def test_present_attributes_raising_property() -> None:
+    """Tests that attributes raising any error are treated as missing, like pydantic does"""
+
+    assert RequiredKeysFilter([AliasedInput, AliasChoicesInput]).present_attributes(RaisingAttributes()) == {'first'}
+
+
+class UserInput(BaseModel):
+    user_id: str = Field(alias='userId')
+
+
+def test_build_schema_instance_with_aliases() -> None:
+    """Tests that instances of the schemas are not filtered by the aliases of their required fields"""
+
+    schema_registry = SchemaRegistry(str)
+    schema_registry.add_schema(UserInput)
+
+    @schema_registry.add_builder
+    def builder(data: UserInput) -> str:
+        return data.user_id
+
+    schema_registry.setup()
+
+    assert schema_registry.build(source_object=UserInput(userId='a')) == 'a'
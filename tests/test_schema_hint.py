@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Literal
+
+import pytest
+from pydantic import BaseModel
+
+from schema_overseer_local import NoMatchingSchemaError, SchemaRegistry, SetupError
+
+
+class InputV1(BaseModel):
+    value: str
+
+
+class InputV2(BaseModel):
+    value: str
+    count: int = 0
+
+
+def v1_builder(data: InputV1) -> str:
+    return 'v1'
+
+
+def v2_builder(data: InputV2) -> str:
+    return 'v2'
+
+
+@pytest.mark.parametrize('engine', ['loop', 'union'])
+def test_schema_hint(engine: Literal['loop', 'union']) -> None:
+    """Tests that only the hinted schema is validated, even if the preceding schema is valid too"""
+
+    schema_registry = SchemaRegistry(str, engine=engine, check_for_single_valid_schema=True)
+    schema_registry.add_schema(InputV1, version='v1')
+    schema_registry.add_schema(InputV2, version='v2')
+    schema_registry.add_builder(v1_builder)
+    schema_registry.add_builder(v2_builder)
+    schema_registry.setup()
+
+    assert schema_registry.build(source_dict={'value': 'a'}, schema_hint='v2') == 'v2'
+    assert schema_registry.build_dump(source_object=InputV1(value='a'), schema_hint='v1') == 'v1'
+    assert asyncio.run(schema_registry.abuild(source_dict={'value': 'a'}, schema_hint='v2')) == 'v2'
+    assert schema_registry.wrong_hints == {}
+
+
+def test_wrong_schema_hint() -> None:
+    """Tests that NoMatchingSchemaError is raised for the unknown or not matching hints, they are counted by version"""
+
+    schema_registry = SchemaRegistry(str)
+    schema_registry.add_schema(InputV1, version='v1')
+    schema_registry.add_schema(InputV2, version='v2')
+    schema_registry.add_builder(v1_builder)
+    schema_registry.add_builder(v2_builder)
+    schema_registry.setup()
+
+    with pytest.raises(NoMatchingSchemaError) as exc_info:
+        schema_registry.build(source_dict={'count': 1}, schema_hint='v2')
+    assert exc_info.value.closest == f'{__name__}.InputV2'
+
+    with pytest.raises(NoMatchingSchemaError):
+        schema_registry.build(source_dict={'value': 'a'}, schema_hint='v3')
+    with pytest.raises(NoMatchingSchemaError):
+        schema_registry.build(source_dict={'value': 'a'}, schema_hint='v4')
+
+    assert schema_registry.wrong_hints == {'v2': 1, '<unknown>': 2}
+
+
+@pytest.mark.parametrize('engine', ['loop', 'union'])
+def test_schema_hint_fallback(engine: Literal['loop', 'union']) -> None:
+    """Tests that all schemas are searched if the hint is wrong and `hint_fallback` is enabled"""
+
+    schema_registry = SchemaRegistry(str, engine=engine, hint_fallback=True)
+    schema_registry.add_schema(InputV1, version='v1')
+    schema_registry.add_schema(InputV2, version='v2')
+    schema_registry.add_builder(v1_builder)
+    schema_registry.add_builder(v2_builder)
+    schema_registry.setup()
+
+    assert schema_registry.build(source_dict={'value': 'a', 'count': 'b'}, schema_hint='v2') == 'v1'
+    assert schema_registry.build(source_dict={'value': 'a'}, schema_hint='v3') == 'v1'
+    assert schema_registry.wrong_hints == {'v2': 1, '<unknown>': 1}
+
+
+def test_duplicate_version() -> None:
+    """Tests that a version can't be registered for several schemas"""
+
+    schema_registry = SchemaRegistry(str)
+    schema_registry.add_schema(InputV1, version='v1')
+
+    with pytest.raises(SetupError, match='InputV1'):
+        schema_registry.add_schema(InputV2, version='v1')
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import List
 
 import pytest
 from pydantic import BaseModel
 
-from schema_overseer_local import OutputValidationError, SchemaRegistry
+from schema_overseer_local import OutputValidationError, SchemaRegistry, SetupError
 
 
 class InputFormat(BaseModel):
@@ -21,6 +22,11 @@ class OutputModel(BaseModel):
     value: int
 
 
+class NestedOutputModel(BaseModel):
+    child: OutputModel
+    children: List[OutputDataclass] = []  # noqa: UP006
+
+
 def test_validate_output_dataclass() -> None:
     """Tests that output is validated when validate_output is True"""
 
@@ -100,7 +106,29 @@ def test_validate_output_pydantic_invalid() -> None:
         return OutputModel.model_construct(value='qwe')  # type: ignore[arg-type]
 
     schema_registry.setup()
-    with pytest.raises(OutputValidationError), pytest.warns(UserWarning):
+    with pytest.raises(OutputValidationError):
+        schema_registry.build(source_dict={'value': '123'})
+
+
+@pytest.mark.parametrize(
+    'output',
+    [
+        NestedOutputModel(child=OutputModel.model_construct(value='qwe')),  # type: ignore[arg-type]
+        NestedOutputModel(child=OutputModel(value=1), children=[OutputDataclass(value='qwe')]),  # type: ignore[arg-type]
+    ],
+)
+def test_validate_output_pydantic_nested_invalid(output: NestedOutputModel) -> None:
+    """Tests that fields of the nested models and dataclasses are validated too"""
+
+    schema_registry = SchemaRegistry(NestedOutputModel, validate_output=True)
+    schema_registry.add_schema(InputFormat)
+
+    @schema_registry.add_builder
+    def builder(data: InputFormat) -> NestedOutputModel:
+        return output
+
+    schema_registry.setup()
+    with pytest.raises(OutputValidationError):
         schema_registry.build(source_dict={'value': '123'})
 
 
@@ -135,3 +163,28 @@ def test_validate_output_int() -> None:
     output = schema_registry.build(source_dict={'value': '123'})
 
     assert output == 123
+
+
+def test_validate_output_first() -> None:
+    """Tests that only the first outputs of each builder are validated with validate_output_first"""
+
+    schema_registry = SchemaRegistry(int, validate_output=True, validate_output_rate=0, validate_output_first=2)
+    schema_registry.add_schema(InputFormat)
+
+    @schema_registry.add_builder
+    def builder(data: InputFormat) -> int:
+        return data.value  # type: ignore[return-value]
+
+    schema_registry.setup()
+    outputs = [schema_registry.build(source_dict={'value': '123'}) for _ in range(3)]
+
+    assert outputs == [123, 123, '123']
+
+
+def test_validate_output_invalid_rate() -> None:
+    """Tests that SetupError is raised for validate_output_rate out of range"""
+
+    schema_registry = SchemaRegistry(int, validate_output=True, validate_output_rate=1.5)
+
+    with pytest.raises(SetupError, match='validate_output_rate'):
+        schema_registry.setup()
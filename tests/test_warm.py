@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import pytest
+from pydantic import BaseModel, ConfigDict
+from pydantic_core import SchemaValidator
+
+from schema_overseer_local import SchemaRegistry, SetupError
+
+
+class DeferredInput(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+    value: str
+
+
+class ForwardRefInput(BaseModel):
+    inner: Inner
+
+
+class Inner(BaseModel):
+    value: int
+
+
+class UnresolvedInput(BaseModel):
+    inner: Undefined  # type: ignore[name-defined]  # noqa: F821
+
+
+def test_setup_warm() -> None:
+    """Tests that validators of the deferred schemas and schemas with forward references are built in setup()"""
+
+    assert not DeferredInput.__pydantic_complete__
+    assert not ForwardRefInput.__pydantic_complete__
+
+    schema_registry = SchemaRegistry(str)
+    schema_registry.add_schema(DeferredInput)
+    schema_registry.add_schema(ForwardRefInput)
+
+    @schema_registry.add_builder
+    def deferred_builder(data: DeferredInput) -> str:
+        return data.value
+
+    @schema_registry.add_builder
+    def forward_ref_builder(data: ForwardRefInput) -> str:
+        return str(data.inner.value)
+
+    schema_registry.setup(warm=True)
+
+    for model in (DeferredInput, ForwardRefInput):
+        assert model.__pydantic_complete__
+        assert isinstance(model.__pydantic_validator__, SchemaValidator)
+    assert schema_registry.build(source_dict={'inner': {'value': 1}}) == '1'
+
+
+def test_setup_warm_unresolved_annotation() -> None:
+    """Tests that SetupError is raised for schemas with annotations, which can't be resolved"""
+
+    schema_registry = SchemaRegistry(str)
+    schema_registry.add_schema(UnresolvedInput)
+
+    @schema_registry.add_builder
+    def builder(data: UnresolvedInput) -> str:
+        return ''
+
+    with pytest.raises(SetupError, match='UnresolvedInput'):
+        schema_registry.setup(warm=True)
+
+
+class PlainOutput:
+    def __init__(self, value: str) -> None:
+        self.value = value
+
+
+def test_setup_warm_unsupported_output_type() -> None:
+    """Tests that output types not supported by pydantic are allowed, if outputs are not validated"""
+
+    schema_registry = SchemaRegistry(PlainOutput)
+    schema_registry.add_schema(Inner)
+
+    @schema_registry.add_builder
+    def builder(data: Inner) -> PlainOutput:
+        return PlainOutput(str(data.value))
+
+    schema_registry.setup(warm=True)
+
+    assert schema_registry.build(source_dict={'value': 1}).value == '1'
@@ -61,10 +61,8 @@ def log_site_search() -> str:
               schema:
                 type: string
     """
-    payload_dict = request.get_json()
-
     try:
-        context = payload_schema_registry.build(source_dict=payload_dict)
+        context = payload_schema_registry.build_json(request.get_data())
     except NoMatchingSchemaError:
         abort(Response('Invalid payload schema', status=400))
 